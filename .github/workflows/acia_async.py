@@ -0,0 +1,273 @@
+"""
+ACIA Async Fetch Mode
+Runs the scraper layer on an asyncio event loop: every search URL and
+homepage fallback of every profile-driven portal is requested at once
+through one shared async client, kept polite by per-host semaphores and
+jittered delays, while parsing runs off the loop in a thread or process pool
+
+aiohttp is used when installed; otherwise requests go through the pooled
+requests session on worker threads, which keeps the same behaviour.
+"""
+
+import asyncio
+import contextvars
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from acia_config import (
+    ASYNC_JITTER,
+    ASYNC_PER_HOST,
+    HOST_DELAY,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    PARSE_WORKERS,
+    POOL_CONNECTIONS,
+)
+from acia_checkpoint import active_journal
+from acia_deadline import MIN_REQUEST_TIME, DeadlineExceeded, current_deadline, ensure_time
+from acia_health import HostUnavailable, host_health
+from acia_http import BROWSER_HEADERS, get_cache, http_get, record_response_metrics
+from acia_metrics import metrics, portal_context
+from acia_parse_pool import finish_parse, get_process_pool, lookup_parsed, parse_args, parse_page, use_process_pool
+from acia_profiles import PROFILES, collect_new
+from acia_replay import get_archive, get_mode
+from acia_scheduler import run_labelled
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+
+class AsyncHttpClient:
+    """Shared async GET client with per-host concurrency caps and jittered spacing"""
+
+    def __init__(self, per_host=ASYNC_PER_HOST, delay=HOST_DELAY, jitter=ASYNC_JITTER):
+        self.per_host = per_host
+        self.delay = delay
+        self.jitter = jitter
+        self._semaphores = {}
+        self._next_slot = {}
+        self._session = None
+
+    async def __aenter__(self):
+        if HAS_AIOHTTP and get_mode() != 'replay':
+            connector = aiohttp.TCPConnector(limit=POOL_CONNECTIONS * self.per_host, limit_per_host=self.per_host)
+            timeout = aiohttp.ClientTimeout(sock_connect=HTTP_CONNECT_TIMEOUT, sock_read=HTTP_READ_TIMEOUT)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout, headers=BROWSER_HEADERS)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _wait_turn(self, host):
+        # No await between reading and writing the slot, so no lock is needed on the loop
+        extra_delay, not_before = host_health.pacing(host)
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now), now + not_before - time.time())
+        self._next_slot[host] = slot + max(self.delay, extra_delay) + random.uniform(0, self.jitter)
+        if slot > now:
+            ensure_time(slot - now + MIN_REQUEST_TIME)
+            metrics.observe('throttle_wait', slot - now, host=host)
+            await asyncio.sleep(slot - now)
+
+    async def get(self, url, params=None):
+        """GET url, returning a requests.Response so parsers and caches work unchanged"""
+        # Pages already fetched by an interrupted attempt of this run are not fetched again
+        journal = active_journal()
+        if journal is not None and (journaled := journal.get(url, params)) is not None:
+            metrics.increment('checkpoint_responses', url=url)
+            return journaled
+
+        host = urlparse(url).netloc.lower()
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.per_host))
+
+        async with semaphore:
+            ensure_time()
+            if get_mode() != 'replay':
+                host_health.check(url)
+            await self._wait_turn(host)
+            if self._session is None:
+                # http_get journals the response itself
+                loop = asyncio.get_running_loop()
+                call = partial(http_get, url, params=params, throttle=False)
+                return await loop.run_in_executor(None, contextvars.copy_context().run, call)
+            response = await self._aiohttp_get(url, params)
+
+        if journal is not None and response.status_code == 200:
+            journal.save(url, params, response)
+        return response
+
+    async def _aiohttp_get(self, url, params):
+        cache = get_cache()
+        cached = cache.load(url, params) if cache else None
+        headers = cache.validators(cached[0]) if cached else {}
+
+        started = time.perf_counter()
+        try:
+            async with self._session.get(url, params=params, headers=headers) as raw:
+                ttfb = time.perf_counter() - started
+                body = await raw.read()
+                response = requests.Response()
+                response.status_code = raw.status
+                response._content = body
+                response.headers = CaseInsensitiveDict(raw.headers)
+                response.url = str(raw.url)
+                response.encoding = raw.charset
+                response.elapsed = timedelta(seconds=ttfb)
+        except Exception:
+            metrics.increment('http_errors', url=url)
+            host_health.record_failure(url)
+            raise
+        record_response_metrics(url, response, time.perf_counter() - started)
+        host_health.record_response(url, response)
+
+        if cache:
+            if response.status_code == 304 and cached:
+                meta, cached_body = cached
+                cache.refresh(url, params, meta, response)
+                response = cache.build_response(meta, cached_body, response)
+            else:
+                cache.store(url, params, response)
+                response.from_cache = False
+        if get_mode() == 'record':
+            get_archive().save(url, params, response)
+        return response
+
+
+async def parse_in_pool(thread_pool, kind, portal, response):
+    """Run the parse stage off the event loop, in the process pool when configured"""
+    fingerprint, cached = lookup_parsed(kind, portal, response)
+    if cached is not None:
+        return cached
+
+    loop = asyncio.get_running_loop()
+    args = parse_args(kind, portal, response)
+    if use_process_pool():
+        result = await loop.run_in_executor(get_process_pool(), parse_page, *args)
+    else:
+        # Carry the portal label into the worker thread
+        result = await loop.run_in_executor(thread_pool, contextvars.copy_context().run, parse_page, *args)
+    return finish_parse(portal, result, fingerprint)
+
+
+def _usable(response):
+    return not isinstance(response, BaseException) and response.status_code == 200
+
+
+async def fetch_profile_async(client, portal, parse_pool):
+    """Fetch every search URL and the fallback of a profile portal concurrently"""
+    profile = PROFILES[portal]
+    print(f"🔍 Fetching {portal} internships (async)...")
+    internships = []
+
+    try:
+        with portal_context(portal), metrics.timer('fetch'):
+            urls = profile.ordered_urls()
+            targets = urls + ([profile.fallback['url']] if profile.fallback else [])
+            responses = await asyncio.gather(*(client.get(url) for url in targets), return_exceptions=True)
+
+            # Parse every usable page in the pool, then merge in cost order up to the quota
+            parse_jobs = [
+                parse_in_pool(parse_pool, 'search', portal, response)
+                for response in responses[:len(urls)] if _usable(response)
+            ]
+            parsed = iter(await asyncio.gather(*parse_jobs, return_exceptions=True))
+
+            seen_links = set()
+            selector_passes = 0
+            skipped = 0
+            for url, response in zip(urls, responses):
+                if isinstance(response, (HostUnavailable, DeadlineExceeded)):
+                    # Never requested: leave the URL's yield and cost history alone
+                    skipped += 1
+                    continue
+                found = 0
+                if _usable(response):
+                    page = next(parsed)
+                    if not isinstance(page, BaseException):
+                        page_internships, hit, passes = page
+                        selector_passes += passes
+                        found = collect_new(internships, page_internships, seen_links, profile.quota)
+                        if found > 0:
+                            profile.record_hit(hit)
+                elapsed = response.elapsed.total_seconds() if not isinstance(response, BaseException) else 0.0
+                profile.record_url(url, found, elapsed)
+
+            profile.finish_report(len(urls) - skipped, selector_passes, len(internships), skipped)
+
+            if not internships and profile.fallback and _usable(responses[-1]):
+                candidates, _, _ = await parse_in_pool(parse_pool, 'homepage', portal, responses[-1])
+                collect_new(internships, candidates, seen_links, profile.quota)
+
+    except Exception as e:
+        print(f"❌ {portal} async fetch failed: {e}")
+
+    print(f"✅ Fetched {len(internships)} {portal} internships")
+    return internships
+
+
+async def _report(name, job, on_result):
+    """Await one portal job under its time budget, turning a crash or timeout into an
+    empty result and reporting it when done"""
+    deadline = current_deadline()
+    with deadline.portal(name):
+        try:
+            result = await asyncio.wait_for(job, deadline.portal_seconds())
+        except asyncio.TimeoutError:
+            deadline.mark_timed_out(name)
+            result = []
+        except Exception as e:
+            print(f"❌ {name} fetcher crashed: {e}")
+            result = []
+    if on_result is not None:
+        on_result(name, result)
+    return result
+
+
+async def run_portals(fetchers, profile_portals, on_result=None):
+    """Fetch all portals on one event loop, calling on_result(name, results) as each finishes"""
+    with ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix='acia-parse') as parse_pool:
+        async with AsyncHttpClient() as client:
+            tasks = []
+            for name, fetcher in fetchers:
+                if name in profile_portals:
+                    job = fetch_profile_async(client, name, parse_pool)
+                else:
+                    # API-style fetchers stay synchronous and run on a worker thread
+                    job = asyncio.to_thread(run_labelled, name, fetcher)
+                tasks.append(_report(name, job, on_result))
+            await asyncio.gather(*tasks)
+
+
+def iter_portals_async(fetchers, profile_portals):
+    """Async counterpart of iter_fetchers_as_completed: the loop runs on a background
+    thread and (name, results) pairs are yielded as each portal finishes"""
+    finished = queue.Queue()
+    done = object()
+
+    def run_loop():
+        try:
+            asyncio.run(run_portals(fetchers, profile_portals, on_result=lambda *item: finished.put(item)))
+        except Exception as e:
+            print(f"❌ Async fetch loop crashed: {e}")
+        finally:
+            finished.put(done)
+
+    loop_thread = threading.Thread(target=run_loop, name='acia-loop', daemon=True)
+    loop_thread.start()
+    while (item := finished.get()) is not done:
+        yield item
+    loop_thread.join()
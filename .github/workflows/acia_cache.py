@@ -0,0 +1,151 @@
+"""
+ACIA HTTP Response Cache
+Persistent on-disk cache keyed by URL and params that revalidates with
+If-None-Match / If-Modified-Since and evicts least-recently-used entries
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from acia_config import HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES
+
+# Response headers worth keeping alongside the body
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+def cache_key(url, params=None):
+    """Stable key for a URL plus its query params"""
+    raw = json.dumps([url, sorted((params or {}).items())], default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def write_atomic(path, data):
+    """Write bytes to path via a temp file so readers never see partial data"""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class HttpCache:
+    """Size-bounded on-disk store of validated responses"""
+
+    def __init__(self, directory=HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + '.json', base + '.body'
+
+    def load(self, url, params=None):
+        """Return (meta, body) for a cached response, or None"""
+        meta_path, body_path = self._paths(cache_key(url, params))
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as handle:
+                meta = json.load(handle)
+            with open(body_path, 'rb') as handle:
+                body = handle.read()
+        except (OSError, ValueError):
+            return None
+
+        # Touch the body so eviction sees this entry as recently used
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+        return meta, body
+
+    def validators(self, meta):
+        """Conditional request headers for a cached entry"""
+        headers = {}
+        if meta.get('ETag'):
+            headers['If-None-Match'] = meta['ETag']
+        if meta.get('Last-Modified'):
+            headers['If-Modified-Since'] = meta['Last-Modified']
+        return headers
+
+    def store(self, url, params, response):
+        """Persist a 200 response that carries ETag or Last-Modified"""
+        if response.status_code != 200:
+            return
+        if not (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+            return
+
+        meta = {name: response.headers.get(name) for name in STORED_HEADERS}
+        meta.update({'url': response.url or url, 'encoding': response.encoding})
+        self._write(cache_key(url, params), meta, response.content)
+
+    def refresh(self, url, params, meta, not_modified):
+        """Update validators from a 304 response without rewriting the body"""
+        changed = False
+        for name in ('ETag', 'Last-Modified'):
+            value = not_modified.headers.get(name)
+            if value and value != meta.get(name):
+                meta[name] = value
+                changed = True
+        if changed:
+            meta_path, _ = self._paths(cache_key(url, params))
+            write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+
+    def _write(self, key, meta, body):
+        meta_path, body_path = self._paths(key)
+        with self._lock:
+            write_atomic(body_path, body)
+            write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+            self._evict()
+
+    def _evict(self):
+        """Drop least-recently-used entries until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith('.body'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, body_path in entries:
+            if total <= self.max_bytes:
+                break
+            for path in (body_path, body_path[:-len('.body')] + '.json'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+
+    def build_response(self, meta, body, not_modified):
+        """Turn a cached entry into a 200 Response for the caller"""
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.headers = CaseInsensitiveDict(
+            {name: meta[name] for name in STORED_HEADERS if meta.get(name)}
+        )
+        response.url = meta.get('url')
+        response.encoding = meta.get('encoding')
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        response.from_cache = True
+        return response
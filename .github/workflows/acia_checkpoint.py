@@ -0,0 +1,143 @@
+"""
+ACIA Run Checkpoints
+Makes an interrupted run resumable: every successful GET is journaled as a
+raw response, each portal's extracted listings are written as soon as the
+portal finishes and every delivered Telegram chunk is ledgered per chat,
+all atomically under the state directory. A rerun with the same portal
+selection serves journaled pages instead of refetching them, restores the
+finished portals and only sends the chunks that did not go out. The
+checkpoint is removed once a run completes.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+from acia_cache import write_atomic
+from acia_config import CHECKPOINT_DIR, CHECKPOINT_MAX_AGE_HOURS, CHECKPOINTS_ENABLED
+from acia_records import read_jsonl, write_jsonl
+from acia_replay import FixtureArchive
+
+MANIFEST = 'manifest.json'
+
+_active = {'checkpoint': None}
+
+
+class ResponseJournal(FixtureArchive):
+    """Raw responses fetched during a checkpointed run"""
+
+    def get(self, url, params=None):
+        """The journaled response for url, or None if it was never fetched"""
+        meta_path, _ = self._paths(url, params)
+        if not os.path.exists(meta_path):
+            return None
+        response = self.load(url, params)
+        response.replayed = False
+        response.from_checkpoint = True
+        return response
+
+
+class RunCheckpoint:
+    """On-disk progress of one run, keyed by its portal selection"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.journal = ResponseJournal(os.path.join(directory, 'responses'))
+        self._lock = threading.Lock()
+        self.manifest = {'created': time.time(), 'portals': {}, 'delivered': {}}
+        self.resumed = False
+
+    @classmethod
+    def open(cls, portals=None, root=CHECKPOINT_DIR, max_age_hours=CHECKPOINT_MAX_AGE_HOURS):
+        """Resume the checkpoint left by an unfinished run, or start an empty one"""
+        key = 'all' if portals is None else hashlib.sha1('|'.join(sorted(portals)).encode('utf-8')).hexdigest()[:12]
+        checkpoint = cls(os.path.join(root, key))
+        try:
+            with open(os.path.join(checkpoint.directory, MANIFEST), 'r', encoding='utf-8') as handle:
+                manifest = json.load(handle)
+        except (OSError, ValueError):
+            manifest = None
+
+        if manifest and time.time() - manifest.get('created', 0) <= max_age_hours * 3600:
+            checkpoint.manifest = manifest
+            checkpoint.resumed = True
+        else:
+            shutil.rmtree(checkpoint.directory, ignore_errors=True)
+        os.makedirs(checkpoint.directory, exist_ok=True)
+        checkpoint._save_manifest()
+        return checkpoint
+
+    def _portal_path(self, portal):
+        return os.path.join(self.directory, 'portals', hashlib.sha1(portal.encode('utf-8')).hexdigest()[:12] + '.jsonl')
+
+    def _save_manifest(self):
+        payload = json.dumps(self.manifest, indent=2).encode('utf-8')
+        write_atomic(os.path.join(self.directory, MANIFEST), payload)
+
+    @property
+    def finished_portals(self):
+        return list(self.manifest['portals'])
+
+    def save_portal(self, portal, internships):
+        """Checkpoint a finished portal's listings"""
+        buffer = io.StringIO()
+        count = write_jsonl(internships, buffer)
+        path = self._portal_path(portal)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_atomic(path, buffer.getvalue().encode('utf-8'))
+        with self._lock:
+            self.manifest['portals'][portal] = count
+            self._save_manifest()
+
+    def restored_portals(self):
+        """(portal, listings) for every portal an earlier attempt finished"""
+        for portal in self.finished_portals:
+            try:
+                with open(self._portal_path(portal), 'r', encoding='utf-8') as handle:
+                    yield portal, list(read_jsonl(handle))
+            except (OSError, ValueError) as e:
+                logging.warning(f"Could not restore {portal} from checkpoint: {e}")
+                with self._lock:
+                    self.manifest['portals'].pop(portal, None)
+
+    def was_delivered(self, chat_id, internships):
+        """True if a chunk with exactly these listings already reached the chat"""
+        links = set(self.manifest['delivered'].get(str(chat_id), ()))
+        return bool(links) and bool(internships) and all(item['link'] in links for item in internships)
+
+    def record_delivery(self, chat_id, internships):
+        with self._lock:
+            self.manifest['delivered'].setdefault(str(chat_id), []).extend(item['link'] for item in internships)
+            self._save_manifest()
+
+    def delivered_any(self):
+        return any(self.manifest['delivered'].values())
+
+    def complete(self):
+        """The run finished; nothing is left to resume"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def open_checkpoint(portals=None, fresh=False):
+    """Checkpoint for a run over portals, made active for the HTTP layer; None when disabled"""
+    if not CHECKPOINTS_ENABLED:
+        _active['checkpoint'] = None
+        return None
+    checkpoint = RunCheckpoint.open(portals, max_age_hours=0 if fresh else CHECKPOINT_MAX_AGE_HOURS)
+    _active['checkpoint'] = checkpoint
+    return checkpoint
+
+
+def close_checkpoint():
+    _active['checkpoint'] = None
+
+
+def active_journal():
+    """Response journal of the run in progress, or None"""
+    checkpoint = _active['checkpoint']
+    return checkpoint.journal if checkpoint is not None else None
@@ -0,0 +1,191 @@
+"""
+ACIA API Collectors
+Scales the JSON API sources beyond one board and one page: any number of
+Greenhouse boards are fetched concurrently, and LinkedIn guest searches
+are paged in concurrent waves with a cursor per query that stops at the
+first page of already-delivered postings
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from acia_config import (
+    COLLECTOR_WORKERS,
+    LINKEDIN_MAX_PAGES,
+    LINKEDIN_PAGE_SIZE,
+    LINKEDIN_PAGE_WAVE,
+)
+from acia_http import http_get
+from acia_metrics import metrics
+from acia_records import Listing
+from acia_relevance import mentions_internship
+
+GREENHOUSE_JOBS_URL = "https://boards-api.greenhouse.io/v1/boards/{token}/jobs"
+LINKEDIN_SEARCH_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+
+
+def parse_query(spec):
+    """'keywords|location' -> (keywords, location); location defaults to India"""
+    keywords, _, location = spec.partition('|')
+    return keywords.strip(), location.strip() or 'India'
+
+
+def _submit(pool, func, *args):
+    """Submit with the caller's context so metrics keep the portal label"""
+    return pool.submit(contextvars.copy_context().run, func, *args)
+
+
+def fetch_greenhouse_board(token):
+    """Internship listings from one Greenhouse board"""
+    # Greenhouse's board API is meant for programmatic use and all boards
+    # share one host, so concurrency is bounded by the worker pool instead
+    # of the per-host throttle
+    response = http_get(GREENHOUSE_JOBS_URL.format(token=token), throttle=False)
+    response.raise_for_status()
+
+    listings = []
+    for job in response.json().get('jobs', []):
+        title = job.get('title', '')
+        if not mentions_internship(title):
+            continue
+        listings.append(Listing(
+            company=job.get('company_name') or token.replace('-', ' ').title(),
+            role=title or 'Unknown Role',
+            location=(job.get('location') or {}).get('name', 'Not specified'),
+            link=job.get('absolute_url', ''),
+            source='Greenhouse'
+        ))
+    return listings
+
+
+def collect_greenhouse(boards, workers=COLLECTOR_WORKERS):
+    """Fetch every board concurrently; a failing board is reported and skipped"""
+    listings = []
+    if not boards:
+        return listings
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(boards))), thread_name_prefix='acia-gh') as pool:
+        futures = [(token, _submit(pool, fetch_greenhouse_board, token)) for token in boards]
+        for token, future in futures:
+            try:
+                board_listings = future.result()
+            except Exception as e:
+                print(f"    ⚠️  Greenhouse board {token} failed: {e}")
+                metrics.increment('collector_errors')
+                continue
+            listings.extend(board_listings)
+
+    metrics.increment('collector_pages', len(boards))
+    return listings
+
+
+class PageCursor:
+    """Paging state of one LinkedIn query"""
+
+    def __init__(self, keywords, location, page_size=LINKEDIN_PAGE_SIZE, max_pages=LINKEDIN_MAX_PAGES):
+        self.keywords = keywords
+        self.location = location
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.start = 0
+        self.pages = 0
+        self.stop_reason = None
+
+    @property
+    def done(self):
+        return self.stop_reason is not None
+
+    def next_starts(self, wave):
+        """Offsets of the next pages to request together"""
+        remaining = self.max_pages - self.pages
+        return [self.start + i * self.page_size for i in range(max(0, min(wave, remaining)))]
+
+    def params(self, start):
+        return {
+            'keywords': self.keywords,
+            'location': self.location,
+            'f_TPR': 'r86400',
+            'start': start
+        }
+
+    def advance(self, element_count, listings, known_count):
+        """Move past one page and decide whether the query is exhausted"""
+        self.pages += 1
+        self.start += self.page_size
+        if element_count == 0:
+            self.stop_reason = 'end of results'
+        elif listings and known_count == len(listings):
+            self.stop_reason = 'reached seen postings'
+        elif self.pages >= self.max_pages:
+            self.stop_reason = 'page limit'
+
+
+def fetch_linkedin_page(cursor, start):
+    """One page of a LinkedIn guest search: (element count, internship listings)"""
+    response = http_get(LINKEDIN_SEARCH_URL, params=cursor.params(start))
+    if response.status_code != 200:
+        raise RuntimeError(f"HTTP {response.status_code}")
+
+    elements = response.json().get('elements', [])
+    listings = []
+    for element in elements:
+        job = element.get('job', {})
+        title = job.get('title', 'Unknown Role')
+        if not mentions_internship(title):
+            continue
+        listings.append(Listing(
+            company=job.get('companyName', 'Unknown Company'),
+            role=title,
+            location=job.get('formattedLocation', 'Not specified'),
+            link=f"https://www.linkedin.com/jobs/view/{job.get('id', '')}",
+            source='LinkedIn'
+        ))
+    return len(elements), listings
+
+
+def collect_linkedin(queries, is_known=None, wave=LINKEDIN_PAGE_WAVE, workers=COLLECTOR_WORKERS):
+    """Page through every query concurrently.
+
+    Each round requests the next `wave` pages of every unfinished query at
+    once; pages are then consumed in order so a query stops at its first
+    empty page or page of postings is_known() reports as already delivered.
+    """
+    cursors = [PageCursor(*parse_query(spec)) for spec in queries]
+    listings = []
+    seen_links = set()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='acia-li') as pool:
+        while True:
+            active = [cursor for cursor in cursors if not cursor.done]
+            if not active:
+                break
+
+            jobs = [
+                (cursor, _submit(pool, fetch_linkedin_page, cursor, start))
+                for cursor in active for start in cursor.next_starts(wave)
+            ]
+            for cursor, future in jobs:
+                if cursor.done:
+                    # An earlier page of this wave already ended the query
+                    continue
+                try:
+                    element_count, page = future.result()
+                except Exception as e:
+                    print(f"    ⚠️  LinkedIn query '{cursor.keywords}' page {cursor.pages + 1} failed: {e}")
+                    metrics.increment('collector_errors')
+                    cursor.stop_reason = 'error'
+                    continue
+
+                metrics.increment('collector_pages')
+                known = sum(1 for listing in page if is_known(listing)) if is_known else 0
+                cursor.advance(element_count, page, known)
+
+                for listing in page:
+                    if listing.link not in seen_links:
+                        seen_links.add(listing.link)
+                        listings.append(listing)
+
+    for cursor in cursors:
+        print(f"  🔎 LinkedIn '{cursor.keywords}' in {cursor.location}: "
+              f"{cursor.pages} page(s), stopped on {cursor.stop_reason}")
+    return listings
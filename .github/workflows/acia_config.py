@@ -0,0 +1,157 @@
+"""
+ACIA Runtime Configuration
+Central place for tunables shared by the fetchers and the pipeline,
+all overridable through environment variables on Render / GitHub Actions
+"""
+
+import os
+
+
+def _env_int(name, default):
+    """Read an integer setting from the environment"""
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name, default):
+    """Read a float setting from the environment"""
+    try:
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_list(name, default, separator=','):
+    """Read a separator-delimited list setting from the environment"""
+    raw = os.environ.get(name, default)
+    return [item.strip() for item in raw.split(separator) if item.strip()]
+
+
+# Concurrent portal scheduler
+MAX_WORKERS = _env_int('ACIA_MAX_WORKERS', 6)
+HOST_DELAY = _env_float('ACIA_HOST_DELAY', 2.0)
+
+# Shared HTTP client
+HTTP_CONNECT_TIMEOUT = _env_float('ACIA_HTTP_CONNECT_TIMEOUT', 5.0)
+HTTP_READ_TIMEOUT = _env_float('ACIA_HTTP_READ_TIMEOUT', 20.0)
+HTTP_RETRIES = _env_int('ACIA_HTTP_RETRIES', 2)
+HTTP_BACKOFF = _env_float('ACIA_HTTP_BACKOFF', 0.5)
+POOL_CONNECTIONS = _env_int('ACIA_POOL_CONNECTIONS', 10)
+POOL_MAXSIZE = _env_int('ACIA_POOL_MAXSIZE', 10)
+
+# Local state shared across runs (caches, stores, checkpoints)
+STATE_DIR = os.environ.get('ACIA_STATE_DIR', '.acia_state')
+
+# Conditional-request HTTP cache
+HTTP_CACHE_ENABLED = os.environ.get('ACIA_HTTP_CACHE', '1') != '0'
+HTTP_CACHE_DIR = os.path.join(STATE_DIR, 'http_cache')
+HTTP_CACHE_MAX_BYTES = _env_int('ACIA_HTTP_CACHE_MAX_MB', 50) * 1024 * 1024
+
+# HTML parsing backend: 'html.parser' or 'lxml'
+PARSER_BACKEND = os.environ.get('ACIA_PARSER', 'html.parser')
+
+# Strained parsing: only build card subtrees, stop after CARD_LIMIT cards
+STRAINED_PARSING = os.environ.get('ACIA_STRAINED_PARSING', '1') != '0'
+CARD_LIMIT = _env_int('ACIA_CARD_LIMIT', 10)
+
+# Declarative portal extraction profiles
+PROFILES_PATH = os.environ.get(
+    'ACIA_PROFILES',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'portal_profiles.json')
+)
+SELECTOR_STATS_PATH = os.path.join(STATE_DIR, 'selector_stats.json')
+
+# Early exit: stop probing a portal once this many internships are collected
+PORTAL_QUOTA = _env_int('ACIA_PORTAL_QUOTA', 10)
+
+# Seen-listings store for "new since last run" delivery
+ONLY_NEW_LISTINGS = os.environ.get('ACIA_ONLY_NEW', '1') != '0'
+SEEN_DB_PATH = os.path.join(STATE_DIR, 'seen_listings.sqlite3')
+
+# Cross-portal deduplication: minimum role token-set (Jaccard) similarity
+DEDUP_THRESHOLD = _env_float('ACIA_DEDUP_THRESHOLD', 0.8)
+
+# Telegram delivery
+TELEGRAM_MAX_LENGTH = _env_int('ACIA_TELEGRAM_MAX_LENGTH', 4096)
+TELEGRAM_RATE = _env_float('ACIA_TELEGRAM_RATE', 1.0)
+TELEGRAM_BURST = _env_int('ACIA_TELEGRAM_BURST', 3)
+TELEGRAM_MAX_RETRIES = _env_int('ACIA_TELEGRAM_MAX_RETRIES', 3)
+
+# Run metrics export (JSON report + Prometheus text file)
+METRICS_DIR = os.environ.get('ACIA_METRICS_DIR', os.path.join(STATE_DIR, 'metrics'))
+
+# HTTP record/replay: 'live', 'record' (live + snapshot) or 'replay' (offline)
+HTTP_MODE = os.environ.get('ACIA_HTTP_MODE', 'live')
+REPLAY_ARCHIVE_DIR = os.environ.get(
+    'ACIA_REPLAY_ARCHIVE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'recorded')
+)
+
+# Execution mode for the scraper layer: 'threads' or 'async'
+EXECUTION_MODE = os.environ.get('ACIA_EXECUTION', 'threads')
+ASYNC_PER_HOST = _env_int('ACIA_ASYNC_PER_HOST', 2)
+ASYNC_JITTER = _env_float('ACIA_ASYNC_JITTER', 0.5)
+PARSE_WORKERS = _env_int('ACIA_PARSE_WORKERS', os.cpu_count() or 2)
+
+# Parse stage: 'thread' parses on the fetching thread, 'process' uses a process pool
+PARSE_POOL = os.environ.get('ACIA_PARSE_POOL', 'thread')
+
+# API collectors: Greenhouse board tokens and LinkedIn "keywords|location" queries
+GREENHOUSE_BOARDS = _env_list('ACIA_GREENHOUSE_BOARDS', 'stripe')
+LINKEDIN_QUERIES = _env_list(
+    'ACIA_LINKEDIN_QUERIES',
+    'data science intern machine learning ai python software engineering|India',
+    separator=';'
+)
+LINKEDIN_PAGE_SIZE = _env_int('ACIA_LINKEDIN_PAGE_SIZE', 25)
+LINKEDIN_MAX_PAGES = _env_int('ACIA_LINKEDIN_MAX_PAGES', 4)
+# Pages of one query requested at once before checking whether to go on
+LINKEDIN_PAGE_WAVE = _env_int('ACIA_LINKEDIN_PAGE_WAVE', 2)
+COLLECTOR_WORKERS = _env_int('ACIA_COLLECTOR_WORKERS', 8)
+
+# Per-host health: circuit breaker and adaptive delays, persisted across runs
+HOST_HEALTH_PATH = os.environ.get('ACIA_HOST_HEALTH_PATH', os.path.join(STATE_DIR, 'host_health.json'))
+BREAKER_THRESHOLD = _env_int('ACIA_BREAKER_THRESHOLD', 3)
+BREAKER_COOLDOWN = _env_float('ACIA_BREAKER_COOLDOWN', 1800.0)
+# Longer than the gap between daily runs, so a dead host is not retried every day
+BREAKER_MAX_COOLDOWN = _env_float('ACIA_BREAKER_MAX_COOLDOWN', 7 * 24 * 3600.0)
+MAX_HOST_DELAY = _env_float('ACIA_MAX_HOST_DELAY', 60.0)
+
+# Content fingerprints: skip parsing pages whose normalized body is unchanged
+FINGERPRINT_CACHE_ENABLED = os.environ.get('ACIA_FINGERPRINT_CACHE', '1') != '0'
+FINGERPRINT_PATH = os.environ.get('ACIA_FINGERPRINT_PATH', os.path.join(STATE_DIR, 'page_fingerprints.json'))
+FINGERPRINT_MAX_AGE_DAYS = _env_int('ACIA_FINGERPRINT_MAX_AGE_DAYS', 14)
+
+# Service mode (--serve): in-process schedule (UTC cron) and local HTTP endpoint
+SERVICE_SCHEDULE = os.environ.get('ACIA_SCHEDULE', '30 8 * * *')
+# "Portal=seconds" pairs for extra runs of single portals, e.g. "LinkedIn=21600"
+PORTAL_INTERVALS = _env_list('ACIA_PORTAL_INTERVALS', '')
+SERVICE_HOST = os.environ.get('ACIA_SERVICE_HOST', '127.0.0.1')
+SERVICE_PORT = _env_int('ACIA_SERVICE_PORT', _env_int('PORT', 5000))
+# Bearer token for /run and /subscriptions; required to serve on a non-loopback host
+SERVICE_TOKEN = os.environ.get('ACIA_SERVICE_TOKEN', '')
+SERVICE_HISTORY = _env_int('ACIA_SERVICE_HISTORY', 20)
+
+# Multi-chat subscriptions; with none registered the digest goes to CHAT_ID unfiltered
+SUBSCRIPTIONS_DB_PATH = os.environ.get('ACIA_SUBSCRIPTIONS_DB', os.path.join(STATE_DIR, 'subscriptions.db'))
+
+# Relevance scoring and ranking
+RELEVANCE_RULES_PATH = os.environ.get(
+    'ACIA_RELEVANCE_RULES',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'relevance_rules.json')
+)
+# Listings per digest, best first; 0 streams every listing in arrival order
+DIGEST_TOP_N = _env_int('ACIA_DIGEST_TOP_N', 30)
+
+# Run deadline: seconds the fetch stage may take in total and per portal (0 = unbounded);
+# whatever was collected by then is still deduplicated and delivered
+RUN_BUDGET = _env_float('ACIA_RUN_BUDGET', 480.0)
+PORTAL_BUDGET = _env_float('ACIA_PORTAL_BUDGET', 180.0)
+
+# Run checkpoints: raw responses, per-portal listings and sent chunks, so a failed run resumes
+CHECKPOINTS_ENABLED = os.environ.get('ACIA_CHECKPOINTS', '1') != '0'
+CHECKPOINT_DIR = os.path.join(STATE_DIR, 'checkpoints')
+# Older checkpoints are discarded rather than resumed
+CHECKPOINT_MAX_AGE_HOURS = _env_float('ACIA_CHECKPOINT_MAX_AGE_HOURS', 12.0)
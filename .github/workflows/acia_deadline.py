@@ -0,0 +1,137 @@
+"""
+ACIA Run Deadline
+Bounds the fetch stage of a run: the run gets a global time budget and
+each portal a budget carved out of it. Requests made past a budget fail
+fast and timeouts are clipped to the time left, so fetchers wind down on
+their own and return what they have; portals still running at the global
+deadline are abandoned. Portals that ran out of time are remembered so
+the digest can say its results for them are partial.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from acia_config import PORTAL_BUDGET, RUN_BUDGET
+from acia_metrics import metrics
+
+# Shortest timeout worth attempting a request with
+MIN_REQUEST_TIME = 1.0
+
+_budget = contextvars.ContextVar('acia_portal_budget', default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised instead of starting work that cannot finish within the budget"""
+
+
+class PortalBudget:
+    """Time allowance for one portal's fetcher"""
+
+    __slots__ = ('name', 'ends_at', 'expired')
+
+    def __init__(self, name, ends_at):
+        self.name = name
+        self.ends_at = ends_at
+        self.expired = False
+
+    def remaining(self):
+        return self.ends_at - time.monotonic()
+
+
+class RunDeadline:
+    """Global budget for one run; a budget of 0 disables every limit"""
+
+    def __init__(self, budget=RUN_BUDGET, portal_budget=PORTAL_BUDGET):
+        self.budget = budget
+        self.portal_budget = portal_budget
+        self.started = time.monotonic()
+        self.ends_at = self.started + budget if budget > 0 else None
+        self.timed_out = {}
+        self._lock = threading.Lock()
+
+    def remaining(self):
+        """Seconds until the global deadline, or None when the run is unbounded"""
+        return None if self.ends_at is None else self.ends_at - time.monotonic()
+
+    @contextmanager
+    def portal(self, name):
+        """Run a portal's fetcher under its budget, noting it if the budget ran out"""
+        if self.ends_at is None:
+            yield None
+            return
+        ends_at = self.ends_at
+        if self.portal_budget > 0:
+            ends_at = min(ends_at, time.monotonic() + self.portal_budget)
+        budget = PortalBudget(name, ends_at)
+        token = _budget.set(budget)
+        try:
+            yield budget
+        finally:
+            _budget.reset(token)
+            if budget.expired:
+                self.mark_timed_out(name)
+
+    def portal_seconds(self):
+        """Budget the next portal to start would get, for cancelling it from outside"""
+        remaining = self.remaining()
+        if remaining is None:
+            return None
+        return max(0.0, min(remaining, self.portal_budget) if self.portal_budget > 0 else remaining)
+
+    def mark_timed_out(self, name):
+        with self._lock:
+            if name in self.timed_out:
+                return
+            self.timed_out[name] = round(time.monotonic() - self.started, 1)
+        metrics.increment('portal_timeouts', portal=name)
+        print(f"⏱️  {name} ran out of time")
+
+    def timed_out_portals(self):
+        with self._lock:
+            return list(self.timed_out)
+
+
+_run = RunDeadline(budget=0)
+
+
+def start_deadline(budget=RUN_BUDGET, portal_budget=PORTAL_BUDGET):
+    """Start the clock for a new run"""
+    global _run
+    _run = RunDeadline(budget, portal_budget)
+    return _run
+
+
+def current_deadline():
+    return _run
+
+
+def time_left():
+    """Seconds left for the current portal (or the run), None if unbounded"""
+    budget = _budget.get()
+    if budget is not None:
+        return budget.remaining()
+    return _run.remaining()
+
+
+def ensure_time(seconds=MIN_REQUEST_TIME):
+    """Raise DeadlineExceeded if less than seconds are left, marking the portal timed out"""
+    left = time_left()
+    if left is None or left >= seconds:
+        return
+    budget = _budget.get()
+    if budget is not None:
+        budget.expired = True
+    raise DeadlineExceeded(f"{budget.name if budget else 'run'} budget exhausted")
+
+
+def clamp_timeout(timeout):
+    """Shrink a requests timeout (seconds or (connect, read)) to the time left"""
+    ensure_time()
+    left = time_left()
+    if left is None:
+        return timeout
+    if isinstance(timeout, tuple):
+        return tuple(min(part, left) for part in timeout)
+    return min(timeout, left)
@@ -0,0 +1,140 @@
+"""
+ACIA Cross-Portal Deduplication
+Merges listings that share a canonical URL, or that have the same
+normalized company and a near-identical role, without comparing every
+pair: StreamingDeduplicator matches roles incrementally, as listings
+arrive, through a prefix-filtered token index per company
+"""
+
+import math
+import re
+from collections import defaultdict
+
+from acia_config import DEDUP_THRESHOLD
+from acia_store import normalize_link
+
+TOKEN = re.compile(r'[a-z0-9+#]+')
+COMPANY_SUFFIXES = {
+    'pvt', 'private', 'ltd', 'limited', 'inc', 'llc', 'llp', 'corp', 'corporation',
+    'co', 'company', 'technologies', 'technology', 'solutions', 'services', 'the'
+}
+
+# Fallback company names the fetchers use when none was found; never block on these
+PLACEHOLDER_COMPANIES = {
+    '', 'unknown', 'unknown company', 'company', 'tech company', 'remote company', 'indian company'
+}
+
+# Words that appear in most roles, least common first; they sort after every other token
+COMMON_ROLE_TOKENS = (
+    'remote', 'paid', 'summer', 'trainee', 'student', 'graduate', 'junior', 'associate',
+    'research', 'product', 'marketing', 'business', 'design', 'web', 'ai', 'ml',
+    'python', 'learning', 'machine', 'analyst', 'developer', 'science', 'data',
+    'engineering', 'engineer', 'software', 'to', 'for', 'of', 'and', 'internship', 'intern'
+)
+COMMON_ROLE_RANK = {token: rank for rank, token in enumerate(COMMON_ROLE_TOKENS, 1)}
+
+
+def normalize_company(company):
+    """Company name without case, punctuation or legal suffixes"""
+    raw = ' '.join(TOKEN.findall((company or '').lower()))
+    if raw in PLACEHOLDER_COMPANIES:
+        return None
+    tokens = [token for token in raw.split() if token not in COMPANY_SUFFIXES]
+    return ' '.join(tokens) or raw
+
+
+def role_tokens(role):
+    return frozenset(TOKEN.findall((role or '').lower()))
+
+
+def role_token_order(token):
+    """Global token order for prefix filtering: ordinary tokens first, common role words last"""
+    return (COMMON_ROLE_RANK.get(token, 0), token)
+
+
+def prefix_tokens(token_set, threshold):
+    """Tokens to index and probe: two roles with Jaccard >= threshold always share one.
+
+    Any fixed order works; putting frequent words last keeps the prefixes selective.
+    """
+    if not token_set:
+        return []
+    ordered = sorted(token_set, key=role_token_order)
+    return ordered[:len(ordered) - math.ceil(threshold * len(ordered)) + 1]
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def print_merge_report(merged):
+    """Summarise merged clusters"""
+    if not merged:
+        return
+    removed = sum(len(cluster) - 1 for cluster in merged)
+    print(f"🧹 Merged {removed} duplicate listing(s) into {len(merged)} cluster(s)")
+    for cluster in merged:
+        keeper = cluster[0]
+        sources = ', '.join(sorted({internship.get('source', 'Unknown') for internship in cluster}))
+        print(f"  🔗 {keeper['role']} at {keeper['company']} ({len(cluster)}x: {sources})")
+
+
+class StreamingDeduplicator:
+    """Online deduplication for listings that arrive one at a time.
+
+    The first record of a cluster is passed on as soon as it is seen and later
+    matches are folded into it. Only a prefix of each role's tokens is indexed,
+    in the fixed role_token_order, which is enough to find every earlier role
+    above the threshold without scanning everything that shares a common word
+    like "intern". A record bridging two already-emitted clusters joins the
+    first one instead of merging them.
+    """
+
+    def __init__(self, threshold=DEDUP_THRESHOLD):
+        self.threshold = threshold
+        self.clusters = []
+        self._by_link = {}
+        self._index = defaultdict(list)
+
+    def add(self, internship):
+        """Record a listing; True if it starts a new cluster"""
+        link = normalize_link(internship.get('link'))
+        company = normalize_company(internship.get('company'))
+        token_set = role_tokens(internship.get('role'))
+        prefix = prefix_tokens(token_set, self.threshold) if company is not None else []
+
+        cluster = self._by_link.get(link)
+        if cluster is None and prefix:
+            checked = set()
+            for token in prefix:
+                for candidate_tokens, candidate in self._index[(company, token)]:
+                    if candidate in checked:
+                        continue
+                    checked.add(candidate)
+                    if jaccard(candidate_tokens, token_set) >= self.threshold:
+                        cluster = candidate
+                        break
+                if cluster is not None:
+                    break
+
+        is_new = cluster is None
+        if is_new:
+            cluster = len(self.clusters)
+            self.clusters.append([])
+        self.clusters[cluster].append(internship)
+        self._by_link.setdefault(link, cluster)
+        for token in prefix:
+            self._index[(company, token)].append((token_set, cluster))
+        return is_new
+
+    def filter(self, internships):
+        """Lazily yield the first listing of every cluster"""
+        for internship in internships:
+            if self.add(internship):
+                yield internship
+
+    def merged(self):
+        """Clusters that absorbed at least one duplicate, in print_merge_report's shape"""
+        return [cluster for cluster in self.clusters if len(cluster) > 1]
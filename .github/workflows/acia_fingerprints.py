@@ -0,0 +1,97 @@
+"""
+ACIA Page Fingerprints
+Remembers, per URL, a digest of the normalized page body together with the
+records extracted from it, so a page that comes back unchanged (even without
+ETag support) skips BeautifulSoup and selector matching entirely
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from acia_cache import write_atomic
+from acia_config import FINGERPRINT_CACHE_ENABLED, FINGERPRINT_MAX_AGE_DAYS, FINGERPRINT_PATH
+from acia_metrics import metrics
+from acia_structured import JSON_SCRIPT_ATTRS
+
+# Parts of a page that change on every request without changing the listings.
+# JSON scripts are kept: structured data is often the only place the listings
+# change while the HTML shell stays the same.
+VOLATILE = re.compile(rb'<script\b([^>]*)>.*?</script\s*>|<style\b.*?</style\s*>|<!--.*?-->', re.IGNORECASE | re.DOTALL)
+WHITESPACE = re.compile(rb'\s+')
+
+
+def _strip_volatile(match):
+    attributes = match.group(1)
+    return match.group(0) if attributes is not None and JSON_SCRIPT_ATTRS.search(attributes) else b''
+
+
+def body_digest(body, salt=''):
+    """Hash of the body with non-JSON scripts, styles, comments and whitespace runs removed"""
+    normalized = WHITESPACE.sub(b' ', VOLATILE.sub(_strip_volatile, body or b''))
+    digest = hashlib.sha256(salt.encode('utf-8'))
+    digest.update(normalized)
+    return digest.hexdigest()
+
+
+class PageFingerprints:
+    """URL -> (digest, extracted result) store, loaded lazily and saved at the end of a run
+
+    Set enabled to False to parse every page, e.g. when benchmarking the parsers.
+    """
+
+    def __init__(self, path=FINGERPRINT_PATH, max_age_days=FINGERPRINT_MAX_AGE_DAYS):
+        self.path = path
+        self.max_age = max_age_days * 86400
+        self._lock = threading.Lock()
+        self._entries = None
+        self._dirty = False
+        self.enabled = True
+
+    def _all(self):
+        if self._entries is None:
+            try:
+                with open(self.path, encoding='utf-8') as handle:
+                    self._entries = json.load(handle)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def lookup(self, key, digest):
+        """Cached result for key if the page still has this digest, else None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._all().get(key)
+            if not entry or entry['digest'] != digest:
+                return None
+            entry['seen'] = time.time()
+            self._dirty = True
+        metrics.increment('parse_skipped')
+        return entry['result']
+
+    def store(self, key, digest, result):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._all()[key] = {'digest': digest, 'result': result, 'seen': time.time()}
+            self._dirty = True
+
+    def save(self):
+        """Write entries back, dropping those not seen for max_age"""
+        with self._lock:
+            if not self._dirty:
+                return
+            cutoff = time.time() - self.max_age
+            entries = {key: entry for key, entry in self._all().items() if entry['seen'] >= cutoff}
+            self._entries = entries
+            self._dirty = False
+            data = json.dumps(entries, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        write_atomic(self.path, data)
+
+
+page_fingerprints = PageFingerprints() if FINGERPRINT_CACHE_ENABLED else None
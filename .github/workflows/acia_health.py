@@ -0,0 +1,175 @@
+"""
+ACIA Host Health
+Per-host circuit breaker and adaptive delays that survive between runs:
+hosts that keep failing are skipped for a growing cooldown instead of
+costing a full timeout per URL, and 429/503 responses (with Retry-After)
+stretch the delay for that host, which then decays on success
+"""
+
+import json
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from acia_cache import write_atomic
+from acia_config import (
+    BREAKER_COOLDOWN,
+    BREAKER_MAX_COOLDOWN,
+    BREAKER_THRESHOLD,
+    HOST_HEALTH_PATH,
+    MAX_HOST_DELAY,
+)
+from acia_metrics import metrics
+
+# Statuses that mean the host is down or refusing us, not that a page is missing
+FAILURE_STATUSES = frozenset([403, 500, 502, 504])
+THROTTLE_STATUSES = frozenset([429, 503])
+
+# Multiplicative increase on throttling, slow decay on success
+DELAY_BACKOFF = 2.0
+DELAY_DECAY = 0.75
+
+
+class HostUnavailable(RuntimeError):
+    """Raised instead of contacting a host whose circuit is open"""
+
+
+def host_of(url):
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - (now or time.time()))
+    except (TypeError, ValueError):
+        return None
+
+
+class HostHealth:
+    """Thread-safe per-host state: consecutive failures, circuit, extra delay, not-before time"""
+
+    def __init__(self, path=HOST_HEALTH_PATH, threshold=BREAKER_THRESHOLD,
+                 cooldown=BREAKER_COOLDOWN, max_cooldown=BREAKER_MAX_COOLDOWN, max_delay=MAX_HOST_DELAY):
+        self.path = path
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._hosts = None
+
+    def _state(self, host):
+        if self._hosts is None:
+            self._hosts = self._load()
+        return self._hosts.setdefault(host, {
+            'failures': 0, 'trips': 0, 'open_until': 0.0, 'delay': 0.0, 'not_before': 0.0
+        })
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """Persist host state for the next run"""
+        with self._lock:
+            if self._hosts is None:
+                return
+            data = json.dumps(self._hosts, indent=2, sort_keys=True).encode('utf-8')
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        write_atomic(self.path, data)
+
+    def check(self, url):
+        """Raise HostUnavailable while the host's circuit is open.
+
+        Once the cooldown has passed the host is half-open: requests go through
+        as trials until one succeeds, which closes the circuit, while the first
+        failure re-opens it straight away for twice as long.
+        """
+        host = host_of(url)
+        with self._lock:
+            open_until = self._state(host)['open_until']
+        remaining = open_until - time.time()
+        if remaining > 0:
+            metrics.increment('circuit_skips', host=host)
+            raise HostUnavailable(f"{host} circuit open for another {int(remaining)}s")
+
+    def pacing(self, host):
+        """(extra delay between requests, wall-clock time before which not to send)"""
+        with self._lock:
+            state = self._state(host)
+            return state['delay'], state['not_before']
+
+    def record_response(self, url, response):
+        """Update the host from a response"""
+        status = response.status_code
+        if status in THROTTLE_STATUSES:
+            self._throttled(url, parse_retry_after(response.headers.get('Retry-After')))
+        elif status in FAILURE_STATUSES:
+            self.record_failure(url)
+        else:
+            self._succeeded(url)
+
+    def record_failure(self, url):
+        """Count a failed request (error, timeout or failure status) and trip the breaker if needed"""
+        host = host_of(url)
+        now = time.time()
+        with self._lock:
+            state = self._state(host)
+            if state['open_until'] > now:
+                # A request that was in flight when the circuit opened
+                return
+            state['failures'] += 1
+            on_trial = state['trips'] > 0
+            if state['failures'] < self.threshold and not on_trial:
+                return
+            state['trips'] += 1
+            cooldown = min(self.max_cooldown, self.cooldown * 2 ** (state['trips'] - 1))
+            state['open_until'] = now + cooldown
+            state['failures'] = 0
+        metrics.increment('circuit_opened', host=host)
+        print(f"  🔌 {host} keeps failing, skipping it for {int(cooldown)}s")
+
+    def _throttled(self, url, retry_after):
+        host = host_of(url)
+        with self._lock:
+            state = self._state(host)
+            state['delay'] = min(self.max_delay, max(1.0, state['delay'] * DELAY_BACKOFF))
+            if retry_after is not None:
+                if retry_after > self.max_delay:
+                    # Too long to wait inside a run: treat it as an open circuit
+                    state['open_until'] = max(state['open_until'], time.time() + min(retry_after, self.max_cooldown))
+                else:
+                    state['not_before'] = time.time() + retry_after
+        metrics.increment('http_throttled', host=host)
+        self.record_failure(url)
+
+    def _succeeded(self, url):
+        with self._lock:
+            state = self._state(host_of(url))
+            state['failures'] = 0
+            state['trips'] = 0
+            state['open_until'] = 0.0
+            state['delay'] = state['delay'] * DELAY_DECAY if state['delay'] > 0.1 else 0.0
+
+    def open_hosts(self):
+        """Hosts currently skipped, with the seconds left"""
+        now = time.time()
+        with self._lock:
+            hosts = self._hosts or {}
+            return {host: int(state['open_until'] - now) for host, state in hosts.items() if state['open_until'] > now}
+
+
+# Shared by the sync and async clients
+host_health = HostHealth()
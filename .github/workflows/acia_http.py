@@ -0,0 +1,185 @@
+"""
+ACIA Shared HTTP Client
+One pooled keep-alive session for every fetcher and the Telegram sender,
+with central timeout, retry, per-host politeness and circuit-breaker policies
+"""
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from acia_cache import HttpCache
+from acia_config import (
+    HTTP_BACKOFF,
+    HTTP_CACHE_ENABLED,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_RETRIES,
+    POOL_CONNECTIONS,
+    POOL_MAXSIZE,
+)
+from acia_checkpoint import active_journal
+from acia_deadline import clamp_timeout, ensure_time
+from acia_health import host_health
+from acia_metrics import metrics
+from acia_replay import get_archive, get_mode
+from acia_scheduler import host_throttle
+
+# Accept-Encoding is left to requests so we only advertise codecs it can decode
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+_session = None
+_session_lock = threading.Lock()
+_cache = None
+
+
+def build_session():
+    """Create a session with per-host connection pools and a retry policy"""
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        raise_on_status=False,
+        # A long Retry-After would stall a worker; acia_health schedules around it instead
+        respect_retry_after_header=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=retry
+    )
+
+    session = requests.Session()
+    session.headers.update(BROWSER_HEADERS)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    """Return the process-wide shared session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def get_cache():
+    """Return the shared on-disk response cache, or None when disabled"""
+    global _cache
+    if _cache is None and HTTP_CACHE_ENABLED:
+        with _session_lock:
+            if _cache is None:
+                _cache = HttpCache()
+    return _cache
+
+
+def close_session():
+    """Close pooled connections, e.g. at the end of a one-shot run"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def record_response_metrics(url, response, seconds):
+    """Split a request into time-to-first-byte and body download and count it"""
+    ttfb = response.elapsed.total_seconds() if response.elapsed else seconds
+    metrics.observe('ttfb', ttfb, url=url)
+    metrics.observe('download', max(0.0, seconds - ttfb), url=url)
+    metrics.increment('http_requests', url=url, status=response.status_code)
+    metrics.increment('http_bytes', len(response.content or b''), url=url)
+    if response.status_code == 304:
+        metrics.increment('http_not_modified', url=url)
+
+
+def http_get(url, params=None, headers=None, timeout=None, use_cache=True, throttle=True, **kwargs):
+    """GET a URL, honouring record/replay mode (see acia_replay)"""
+    mode = get_mode()
+    if mode == 'replay':
+        with metrics.timer('replay', url=url):
+            return get_archive().load(url, params)
+
+    # Pages already fetched by an interrupted attempt of this run are not fetched again
+    journal = active_journal()
+    if journal is not None and (journaled := journal.get(url, params)) is not None:
+        metrics.increment('checkpoint_responses', url=url)
+        return journaled
+
+    response = _live_get(url, params, headers, timeout, use_cache, throttle, **kwargs)
+    if mode == 'record':
+        get_archive().save(url, params, response)
+    if journal is not None and response.status_code == 200:
+        journal.save(url, params, response)
+    return response
+
+
+def _live_get(url, params, headers, timeout, use_cache, throttle, **kwargs):
+    """GET through the shared session, revalidating against the on-disk cache"""
+    cache = get_cache() if use_cache else None
+    cached = cache.load(url, params) if cache else None
+
+    if cached:
+        headers = dict(headers or {}, **cache.validators(cached[0]))
+
+    host_health.check(url)
+    if throttle:
+        host_throttle.wait(url)
+    # Never wait on a response past the run or portal deadline
+    requested = timeout or DEFAULT_TIMEOUT
+    timeout = clamp_timeout(requested)
+    started = time.perf_counter()
+    try:
+        response = get_session().get(
+            url,
+            params=params,
+            headers=headers,
+            timeout=timeout,
+            **kwargs
+        )
+    except Exception as e:
+        metrics.increment('http_errors', url=url)
+        if timeout != requested and isinstance(e, requests.exceptions.Timeout):
+            # Cut short by the deadline, not the host's fault: raises DeadlineExceeded
+            ensure_time()
+        else:
+            host_health.record_failure(url)
+        raise
+    record_response_metrics(url, response, time.perf_counter() - started)
+    host_health.record_response(url, response)
+
+    if cache:
+        if response.status_code == 304 and cached:
+            meta, body = cached
+            cache.refresh(url, params, meta, response)
+            return cache.build_response(meta, body, response)
+        cache.store(url, params, response)
+
+    response.from_cache = False
+    return response
+
+
+def http_post(url, data=None, json=None, timeout=None, **kwargs):
+    """POST through the shared session (no retries, to avoid duplicate sends)"""
+    with metrics.timer('http_post'):
+        return get_session().post(
+            url,
+            data=data,
+            json=json,
+            timeout=timeout or DEFAULT_TIMEOUT,
+            **kwargs
+        )
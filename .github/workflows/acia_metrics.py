@@ -0,0 +1,155 @@
+"""
+ACIA Run Metrics
+Thread-safe timers and counters labelled by portal, URL and stage,
+exported after every run as a JSON report and a Prometheus text file
+
+requests does not expose DNS or TLS timings separately, so they are
+folded into the 'ttfb' stage (connect + TLS + server time to headers);
+'download' is the remaining time spent reading the body.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from acia_cache import write_atomic
+from acia_config import METRICS_DIR
+
+# A context variable rather than a thread-local so asyncio tasks get their own label too
+_portal = contextvars.ContextVar('acia_portal', default=None)
+
+
+def current_portal():
+    """Portal label of the fetcher running in this thread or task"""
+    return _portal.get()
+
+
+@contextmanager
+def portal_context(portal):
+    """Label every metric recorded in this thread or task with portal"""
+    token = _portal.set(portal)
+    try:
+        yield
+    finally:
+        _portal.reset(token)
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RunMetrics:
+    """Timers (count / total / max seconds) and counters for one pipeline run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.timers = {}
+            self.counters = {}
+
+    def _labels(self, labels):
+        labels = dict(labels)
+        labels.setdefault('portal', current_portal())
+        return _label_key(labels)
+
+    def observe(self, stage, seconds, **labels):
+        """Record one timing for a stage"""
+        key = (stage, self._labels(labels))
+        with self._lock:
+            count, total, worst = self.timers.get(key, (0, 0.0, 0.0))
+            self.timers[key] = (count + 1, total + seconds, max(worst, seconds))
+
+    @contextmanager
+    def timer(self, stage, **labels):
+        """Time the enclosed block as one observation of stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, **labels)
+
+    def increment(self, name, value=1, **labels):
+        """Add value to a counter"""
+        key = (name, self._labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def report(self):
+        """Plain-dict snapshot of everything recorded so far"""
+        with self._lock:
+            timers = [
+                {'stage': stage, 'labels': dict(labels), 'count': count,
+                 'total_seconds': round(total, 6), 'max_seconds': round(worst, 6)}
+                for (stage, labels), (count, total, worst) in sorted(self.timers.items())
+            ]
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+            return {
+                'started_at': datetime.fromtimestamp(self.started).strftime('%Y-%m-%d %H:%M:%S'),
+                'duration_seconds': round(time.time() - self.started, 3),
+                'timers': timers,
+                'counters': counters
+            }
+
+    def prometheus_text(self, report=None):
+        """Render the report in Prometheus text exposition format"""
+        report = report or self.report()
+
+        def series(name, labels, value):
+            if labels:
+                rendered = ','.join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items()))
+                return f"{name}{{{rendered}}} {value}"
+            return f"{name} {value}"
+
+        lines = [
+            '# HELP acia_run_duration_seconds Wall-clock duration of the last run',
+            '# TYPE acia_run_duration_seconds gauge',
+            series('acia_run_duration_seconds', {}, report['duration_seconds']),
+            '# HELP acia_run_timestamp_seconds Unix time the last run started',
+            '# TYPE acia_run_timestamp_seconds gauge',
+            series('acia_run_timestamp_seconds', {}, int(self.started)),
+        ]
+
+        stats = (
+            ('acia_stage_seconds_total', 'Seconds spent per stage', 'total_seconds'),
+            ('acia_stage_calls_total', 'Observations per stage', 'count'),
+            ('acia_stage_seconds_max', 'Slowest single observation per stage', 'max_seconds'),
+        )
+        for metric, help_text, field in stats:
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f"# TYPE {metric} {'gauge' if field == 'max_seconds' else 'counter'}")
+            for timer in report['timers']:
+                lines.append(series(metric, dict(timer['labels'], stage=timer['stage']), timer[field]))
+
+        lines.append('# HELP acia_events_total Pipeline event counters')
+        lines.append('# TYPE acia_events_total counter')
+        for counter in report['counters']:
+            lines.append(series('acia_events_total', dict(counter['labels'], name=counter['name']), counter['value']))
+
+        return '\n'.join(lines) + '\n'
+
+    def export(self, directory=METRICS_DIR):
+        """Write run_report.json and acia.prom into directory"""
+        os.makedirs(directory, exist_ok=True)
+        report = self.report()
+        write_atomic(os.path.join(directory, 'run_report.json'), json.dumps(report, indent=2).encode('utf-8'))
+        write_atomic(os.path.join(directory, 'acia.prom'), self.prometheus_text(report).encode('utf-8'))
+        return report
+
+
+# Process-wide registry used by the fetchers and the pipeline
+metrics = RunMetrics()
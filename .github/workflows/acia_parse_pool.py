@@ -0,0 +1,140 @@
+"""
+ACIA Parse Stage
+Separates HTML extraction from downloading: fetchers hand raw bytes to
+the parse stage and get compact record tuples back, either on the
+calling thread or from a process pool that spreads BeautifulSoup work
+across cores instead of contending for one GIL. Pages whose content
+fingerprint is unchanged since the last run are not parsed at all, and
+pages carrying JobPosting structured data skip BeautifulSoup entirely.
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from acia_config import PARSE_POOL, PARSE_WORKERS
+from acia_metrics import metrics
+from acia_fingerprints import body_digest, page_fingerprints
+from acia_profiles import PROFILES, extract_homepage, extract_search_page
+from acia_records import Listing
+from acia_structured import STRUCTURED_HIT, extract_structured
+
+# Order of the fields in a compact record tuple
+RECORD_FIELDS = ('company', 'role', 'location', 'link')
+
+# Bump when extraction logic changes so fingerprinted pages are parsed again
+PARSER_VERSION = '2'
+
+# Homepage fallbacks keep the same cap as the anchor scan
+HOMEPAGE_LIMIT = 5
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def decode_body(body, encoding):
+    """Decode a response body the way response.text would for a declared charset"""
+    try:
+        return body.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        return body.decode('utf-8', errors='replace')
+
+
+def parse_page(kind, portal, body, encoding, last_hit=None):
+    """Worker entry point: raw bytes in, (record tuples, hit selector, selector passes, seconds) out
+
+    last_hit is the parent's preferred card selector; spawned workers keep
+    their own PROFILES and never see record_hit.
+    """
+    started = time.perf_counter()
+    profile = PROFILES[portal]
+    limit = HOMEPAGE_LIMIT if kind == 'homepage' else profile.card_limit
+    internships = extract_structured(profile, body, limit) if profile.structured else []
+
+    if internships:
+        hit, passes = STRUCTURED_HIT, 0
+    elif kind == 'homepage':
+        internships, hit, passes = extract_homepage(portal, decode_body(body, encoding)), None, 0
+    else:
+        internships, hit, passes = extract_search_page(portal, decode_body(body, encoding), last_hit)
+
+    rows = [tuple(getattr(internship, field) for field in RECORD_FIELDS) for internship in internships]
+    return rows, hit, passes, time.perf_counter() - started
+
+
+def parse_args(kind, portal, response):
+    """Arguments for one parse_page job, carrying the current preferred selector"""
+    return (kind, portal, response.content, response.encoding, PROFILES[portal].stats.get('last_hit'))
+
+
+def expand_records(portal, rows):
+    """Turn compact record tuples back into listings stamped with this run's timestamp"""
+    return [Listing(*row, source=portal) for row in rows]
+
+
+def use_process_pool():
+    return PARSE_POOL == 'process'
+
+
+def get_process_pool():
+    """Shared process pool, started with spawn so worker threads' locks are never forked"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=PARSE_WORKERS,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+    return _pool
+
+
+def shutdown_parse_pool():
+    """Stop the worker processes at the end of a run"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def lookup_parsed(kind, portal, response):
+    """Check the page fingerprint before parsing.
+
+    Returns (fingerprint, cached (internships, hit selector, passes) or None);
+    pass the fingerprint on to finish_parse so a fresh parse is remembered.
+    """
+    if page_fingerprints is None:
+        return None, None
+    key = f"{portal}|{kind}|{response.url}"
+    digest = body_digest(response.content, PROFILES[portal].signature + PARSER_VERSION)
+    cached = page_fingerprints.lookup(key, digest)
+    if cached is None:
+        return (key, digest), None
+    rows, hit, passes = cached
+    return (key, digest), (expand_records(portal, rows), hit, passes)
+
+
+def finish_parse(portal, result, fingerprint=None):
+    """Unpack a parse_page result, recording worker time when it ran out of process"""
+    rows, hit, passes, seconds = result
+    if use_process_pool():
+        metrics.observe('parse_worker', seconds)
+    if hit == STRUCTURED_HIT:
+        metrics.increment('structured_pages')
+    if fingerprint is not None:
+        page_fingerprints.store(*fingerprint, [rows, hit, passes])
+    return expand_records(portal, rows), hit, passes
+
+
+def parse_response(kind, portal, response):
+    """Run the parse stage for a downloaded response; returns (internships, hit selector, passes)"""
+    fingerprint, cached = lookup_parsed(kind, portal, response)
+    if cached is not None:
+        return cached
+
+    args = parse_args(kind, portal, response)
+    if use_process_pool():
+        return finish_parse(portal, get_process_pool().submit(parse_page, *args).result(), fingerprint)
+    return finish_parse(portal, parse_page(*args), fingerprint)
@@ -0,0 +1,204 @@
+"""
+ACIA HTML Parsing Backends
+Pluggable tree builders (html.parser, lxml) and compiled card selectors
+that can run either as soupsieve CSS or as lxml XPath
+"""
+
+import re
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+from acia_config import PARSER_BACKEND
+
+try:
+    import lxml.html
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# tag.class.class[attr op "value"] - the only selector shapes the portals use
+_COMPOUND = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<rest>(?:\.[\w-]+|\[[^\]]+\])*)$')
+_CLASS = re.compile(r'\.([\w-]+)')
+_FEED_CHUNK = 16 * 1024
+_ATTR = re.compile(r'\[\s*([\w-]+)\s*(?:([*^$~]?=)\s*["\']?([^"\'\]]*)["\']?)?\s*\]')
+
+
+def available_backends():
+    """Names of the tree builders usable in this environment"""
+    return ['html.parser', 'lxml'] if HAS_LXML else ['html.parser']
+
+
+def make_soup(markup, backend=None, parse_only=None):
+    """Build a BeautifulSoup tree with the configured backend"""
+    backend = backend or PARSER_BACKEND
+    if backend not in available_backends():
+        backend = 'html.parser'
+    return BeautifulSoup(markup, backend, parse_only=parse_only)
+
+
+def _class_list(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        return value.split()
+    return list(value)
+
+
+class CardSelector:
+    """A compound CSS selector compiled once for soupsieve, lxml and raw matching"""
+
+    def __init__(self, selector):
+        match = _COMPOUND.match(selector.strip())
+        if not match or not (match.group('tag') or match.group('rest')):
+            raise ValueError(f"Unsupported card selector: {selector}")
+
+        self.selector = selector
+        self.tag = None if match.group('tag') in (None, '*') else match.group('tag').lower()
+        self.classes = _CLASS.findall(re.sub(r'\[[^\]]*\]', '', match.group('rest')))
+        self.attrs = [(name.lower(), op, value) for name, op, value in _ATTR.findall(match.group('rest'))]
+        self.css = soupsieve.compile(selector)
+        self._xpath = None
+
+    def matches(self, name, attrs):
+        """Match a tag name and raw attribute dict (usable as a SoupStrainer rule)"""
+        if self.tag and name != self.tag:
+            return False
+        attrs = attrs or {}
+
+        if self.classes:
+            present = _class_list(attrs.get('class'))
+            if not all(cls in present for cls in self.classes):
+                return False
+
+        for attr_name, op, expected in self.attrs:
+            value = attrs.get(attr_name)
+            if value is None:
+                return False
+            if not isinstance(value, str):
+                value = ' '.join(value)
+            if op == '=' and value != expected:
+                return False
+            if op == '*=' and expected not in value:
+                return False
+            if op == '^=' and not value.startswith(expected):
+                return False
+            if op == '$=' and not value.endswith(expected):
+                return False
+            if op == '~=' and expected not in value.split():
+                return False
+        return True
+
+    @property
+    def xpath(self):
+        """Equivalent XPath expression"""
+        predicates = []
+        for cls in self.classes:
+            predicates.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')")
+        for name, op, value in self.attrs:
+            if not op:
+                predicates.append(f"@{name}")
+            elif op == '=':
+                predicates.append(f"@{name}='{value}'")
+            elif op == '*=':
+                predicates.append(f"contains(@{name}, '{value}')")
+            elif op == '^=':
+                predicates.append(f"starts-with(@{name}, '{value}')")
+            elif op == '$=':
+                predicates.append(f"substring(@{name}, string-length(@{name}) - {len(value) - 1})='{value}'")
+            elif op == '~=':
+                predicates.append(f"contains(concat(' ', normalize-space(@{name}), ' '), ' {value} ')")
+
+        expression = '//' + (self.tag or '*')
+        if predicates:
+            expression += '[' + ' and '.join(predicates) + ']'
+        return expression
+
+    def select(self, soup, limit=0):
+        """Select matching tags from a BeautifulSoup tree"""
+        return self.css.select(soup, limit=limit)
+
+    def select_lxml(self, root):
+        """Select matching elements from an lxml tree with a compiled XPath"""
+        if self._xpath is None:
+            self._xpath = etree.XPath(self.xpath)
+        return self._xpath(root)
+
+    def __repr__(self):
+        return f"CardSelector({self.selector!r})"
+
+
+def compile_selectors(selectors):
+    """Compile a list of CSS card selectors"""
+    return [CardSelector(selector) for selector in selectors]
+
+
+def lxml_document(markup):
+    """Parse markup into a native lxml tree"""
+    if not HAS_LXML:
+        raise RuntimeError("lxml is not installed")
+    return lxml.html.document_fromstring(markup)
+
+
+class CardStrainer(SoupStrainer):
+    """SoupStrainer that keeps only the subtrees matching any card selector"""
+
+    def __init__(self, selectors):
+        super().__init__()
+        self.selectors = selectors
+
+    def matches_card(self, name, attrs):
+        return any(selector.matches(name, attrs) for selector in self.selectors)
+
+    # bs4 < 4.13 asks search_tag() whether to build each top-level tag
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        if hasattr(markup_name, 'attrs'):
+            markup_name, markup_attrs = markup_name.name, markup_name.attrs
+        return markup_name if self.matches_card(markup_name, markup_attrs) else None
+
+    # bs4 >= 4.13 asks allow_tag_creation() / allow_string_creation() instead
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self.matches_card(name, attrs)
+
+    def allow_string_creation(self, string):
+        return False
+
+
+def find_cutoff(markup, selector, limit):
+    """Offset just past the limit-th closed match of selector, or None to read everything"""
+    if not HAS_LXML or limit <= 0:
+        return None
+
+    parser = etree.HTMLPullParser(events=('start', 'end'))
+    open_matches = 0
+    closed_matches = 0
+
+    for offset in range(0, len(markup), _FEED_CHUNK):
+        parser.feed(markup[offset:offset + _FEED_CHUNK])
+
+        for event, element in parser.read_events():
+            if not isinstance(element.tag, str) or not selector.matches(element.tag, element.attrib):
+                continue
+            if event == 'start':
+                open_matches += 1
+            else:
+                open_matches -= 1
+                closed_matches += 1
+
+        if closed_matches >= limit and open_matches == 0:
+            return offset + _FEED_CHUNK
+    return None
+
+
+def strained_soup(markup, selectors, limit=0, backend=None):
+    """Parse only the card subtrees, reading no further than the limit-th preferred card
+
+    The first selector is the one the cascade prefers; once it has matched
+    limit cards the rest of the page cannot change what the fetcher keeps.
+    """
+    if limit and selectors:
+        cutoff = find_cutoff(markup, selectors[0], limit)
+        if cutoff is not None and cutoff < len(markup):
+            markup = markup[:cutoff]
+    return make_soup(markup, backend=backend, parse_only=CardStrainer(selectors))
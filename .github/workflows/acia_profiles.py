@@ -0,0 +1,301 @@
+"""
+ACIA Portal Extraction Profiles
+Loads the declarative per-portal profiles from portal_profiles.json,
+compiles every selector once at startup and remembers which card
+selector last succeeded so the next run tries it first
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+
+import soupsieve
+
+from acia_cache import write_atomic
+from acia_config import CARD_LIMIT, PORTAL_QUOTA, PROFILES_PATH, SELECTOR_STATS_PATH, STRAINED_PARSING
+from acia_metrics import metrics
+from acia_parsing import compile_selectors, make_soup, strained_soup
+from acia_records import Listing
+from acia_relevance import mentions_internship
+
+COMPANY_IN_TITLE = re.compile(r'at\s+([^\n|]+)', re.IGNORECASE)
+
+# Assumed seconds per request for URLs with no history yet
+DEFAULT_URL_COST = 1.0
+
+_stats_lock = threading.Lock()
+
+
+def absolute_link(href, base_url, domain=None):
+    """Resolve a card href against the portal, or None if it isn't a usable link"""
+    if not href:
+        return None
+    if href.startswith('http'):
+        link = href
+    elif href.startswith('/'):
+        link = base_url + href
+    else:
+        return None
+    if domain and domain not in link:
+        return None
+    return link
+
+
+def element_text(element):
+    return element.get_text().strip() if element else ''
+
+
+class PortalProfile:
+    """Compiled extraction rules for one portal"""
+
+    def __init__(self, name, spec, stats=None):
+        self.name = name
+        self.base_url = spec['base_url']
+        self.search_urls = list(spec.get('search_urls', []))
+        self.card_selectors = compile_selectors(spec.get('card_selectors', []))
+        self.card_limit = spec.get('card_limit', CARD_LIMIT)
+        self.quota = spec.get('quota', PORTAL_QUOTA)
+        self.fields = {
+            field: [soupsieve.compile(selector) for selector in selectors]
+            for field, selectors in spec.get('fields', {}).items()
+        }
+        self.link_domain = spec.get('link_domain')
+        self.require_company = spec.get('require_company', True)
+        self.default_location = spec.get('default_location', 'Not specified')
+        self.structured = spec.get('structured_data', True)
+
+        self.fallback = dict(spec['fallback']) if spec.get('fallback') else None
+        if self.fallback:
+            self.fallback['anchors'] = soupsieve.compile(self.fallback.get('anchors', 'a[href]'))
+
+        # Changes whenever the extraction rules do, so cached extractions go stale with them
+        self.signature = hashlib.sha1(
+            json.dumps([spec, self.card_limit], sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+        self.stats = stats if stats is not None else {'last_hit': None, 'hits': {}}
+        self.last_report = {}
+
+    def ordered_selectors(self, last_hit=None):
+        """Card selectors with the last successful one moved to the front
+
+        Parse workers in other processes pass the parent's last_hit, since
+        their own copy of the stats is only as fresh as their start.
+        """
+        last_hit = last_hit or self.stats.get('last_hit')
+        preferred = [s for s in self.card_selectors if s.selector == last_hit]
+        return preferred + [s for s in self.card_selectors if s.selector != last_hit]
+
+    def ordered_urls(self):
+        """Search URLs ordered by past internships per second, best first
+
+        Yield and cost are smoothed so untried URLs keep a fair chance and
+        keep their declared order among themselves.
+        """
+        url_stats = self.stats.get('urls', {})
+
+        def value(item):
+            index, url = item
+            stats = url_stats.get(url, {})
+            requests_made = stats.get('requests', 0)
+            yield_rate = (stats.get('yield', 0) + 1) / (requests_made + 1)
+            cost = (stats.get('seconds', 0.0) + DEFAULT_URL_COST) / (requests_made + 1)
+            return (-yield_rate / cost, index)
+
+        return [url for _, url in sorted(enumerate(self.search_urls), key=value)]
+
+    def record_url(self, url, found, seconds):
+        """Accumulate request count, yield and latency for a search URL"""
+        with _stats_lock:
+            stats = self.stats.setdefault('urls', {}).setdefault(url, {'requests': 0, 'yield': 0, 'seconds': 0.0})
+            stats['requests'] += 1
+            stats['yield'] += found
+            stats['seconds'] = round(stats['seconds'] + seconds, 3)
+
+    def record_hit(self, selector):
+        """Remember the selector (CSS string) that produced internships this run
+
+        Hits from the structured-data fast path are counted but never become
+        last_hit, so the card selector order survives for pages without it.
+        """
+        with _stats_lock:
+            if any(s.selector == selector for s in self.card_selectors):
+                self.stats['last_hit'] = selector
+            hits = self.stats.setdefault('hits', {})
+            hits[selector] = hits.get(selector, 0) + 1
+
+    def finish_report(self, requests_made, selector_passes, collected, skipped=0):
+        """Record how much work the quota saved versus an exhaustive URL x selector sweep
+
+        skipped URLs (open circuit or run deadline) were not saved by the quota
+        and are left out of the savings.
+        """
+        requests_saved = len(self.search_urls) - requests_made - skipped
+        passes_saved = (len(self.search_urls) - skipped) * len(self.card_selectors) - selector_passes
+        self.last_report = {
+            'requests': requests_made,
+            'skipped': skipped,
+            'requests_saved': requests_saved,
+            'selector_passes': selector_passes,
+            'selector_passes_saved': passes_saved,
+            'quota_met': collected >= self.quota
+        }
+        metrics.increment('requests_saved', requests_saved)
+        metrics.increment('selector_passes_saved', passes_saved)
+        if self.last_report['quota_met']:
+            print(f"  💡 {self.name} quota of {self.quota} met after {requests_made} request(s): "
+                  f"saved {requests_saved} request(s) and {passes_saved} selector pass(es)")
+
+    def first_match(self, card, field):
+        """First element in card matching the field's selectors, tried in order"""
+        for selector in self.fields.get(field, []):
+            element = selector.select_one(card)
+            if element is not None:
+                return element
+        return None
+
+    def extract(self, card):
+        """Build an internship dict from a card, or None if it isn't one"""
+        title = element_text(self.first_match(card, 'title')) or 'Unknown Role'
+        if not mentions_internship(title):
+            return None
+
+        company = element_text(self.first_match(card, 'company')) or 'Unknown Company'
+        if self.require_company and company == 'Unknown Company':
+            return None
+
+        link_element = self.first_match(card, 'link')
+        link = absolute_link(link_element.get('href', '') if link_element else '', self.base_url, self.link_domain)
+        if not link:
+            return None
+
+        location = element_text(self.first_match(card, 'location')) or self.default_location
+        return Listing(company, title, location, link, self.name)
+
+    def extract_fallback(self, soup, limit=5):
+        """Scan a homepage for anchors that look like internships"""
+        if not self.fallback:
+            return []
+
+        keyword = self.fallback.get('keyword', 'intern')
+        internships = []
+        for anchor in self.fallback['anchors'].select(soup):
+            title = element_text(anchor)
+            if keyword not in title.lower():
+                continue
+
+            link = absolute_link(anchor.get('href', ''), self.base_url, self.link_domain)
+            if not link:
+                continue
+
+            company_match = COMPANY_IN_TITLE.search(title)
+            internships.append(Listing(
+                company_match.group(1).strip() if company_match else self.fallback.get('company', 'Company'),
+                title,
+                self.fallback.get('location', self.default_location),
+                link,
+                self.name
+            ))
+            if len(internships) >= limit:
+                break
+        return internships
+
+
+def parse_search_page(markup, profile, selectors=None):
+    """Parse a portal search page, building only its card subtrees when strained parsing is on"""
+    with metrics.timer('parse'):
+        if STRAINED_PARSING:
+            return strained_soup(markup, selectors or profile.ordered_selectors(), limit=profile.card_limit)
+        return make_soup(markup)
+
+
+def extract_search_page(portal, markup, last_hit=None):
+    """Parse one search page and run the card selector cascade
+
+    Returns (internships, CSS of the selector that produced them or None,
+    number of selector passes made).
+    """
+    profile = PROFILES[portal]
+    selectors = profile.ordered_selectors(last_hit)
+    soup = parse_search_page(markup, profile, selectors)
+    passes = 0
+
+    for selector in selectors:
+        passes += 1
+        with metrics.timer('select', selector=selector.selector):
+            cards = selector.select(soup, limit=profile.card_limit)
+        if not cards:
+            metrics.increment('selector_misses', selector=selector.selector)
+            continue
+
+        internships = []
+        for card in cards:
+            try:
+                with metrics.timer('extract'):
+                    internship = profile.extract(card)
+                if internship:
+                    internships.append(internship)
+            except Exception as e:
+                print(f"    ⚠️  Error processing {portal} card: {e}")
+                continue
+
+        if internships:
+            return internships, selector.selector, passes
+    return [], None, passes
+
+
+def extract_homepage(portal, markup):
+    """Run a portal's homepage fallback over a fetched page"""
+    with metrics.timer('parse'):
+        soup = make_soup(markup)
+    return PROFILES[portal].extract_fallback(soup)
+
+
+def collect_new(internships, candidates, seen_links, quota):
+    """Append candidates with unseen links until quota; returns how many were added"""
+    added = 0
+    for internship in candidates:
+        if len(internships) >= quota:
+            break
+        if internship['link'] in seen_links:
+            continue
+        seen_links.add(internship['link'])
+        internships.append(internship)
+        added += 1
+        print(f"  📋 {internship['role']} at {internship['company']}")
+    return added
+
+
+def load_selector_stats(path=SELECTOR_STATS_PATH):
+    """Per-portal selector hit history from previous runs"""
+    try:
+        with open(path, 'r', encoding='utf-8') as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_selector_stats(profiles, path=SELECTOR_STATS_PATH):
+    """Persist selector hit history for the next run"""
+    with _stats_lock:
+        data = {name: profile.stats for name, profile in profiles.items()}
+        payload = json.dumps(data, indent=2, sort_keys=True).encode('utf-8')
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    write_atomic(path, payload)
+
+
+def load_profiles(path=PROFILES_PATH, stats_path=SELECTOR_STATS_PATH):
+    """Load and compile every portal profile"""
+    with open(path, 'r', encoding='utf-8') as handle:
+        specs = json.load(handle)
+    stats = load_selector_stats(stats_path)
+    return {
+        name: PortalProfile(name, spec, stats.get(name))
+        for name, spec in specs.items()
+    }
+
+
+# Compiled once at import so fetchers never re-parse selector strings
+PROFILES = load_profiles()
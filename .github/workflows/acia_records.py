@@ -0,0 +1,128 @@
+"""
+ACIA Listing Records
+Compact listing type used from extraction to delivery: __slots__ instead
+of a dict per listing, interned company/location/source strings and one
+scrape timestamp per run, with JSON Lines and columnar serialization for
+keeping a long listing history cheaply
+"""
+
+import json
+import sys
+from datetime import datetime
+
+FIELDS = ('company', 'role', 'location', 'link', 'source', 'date_scraped')
+
+# Low-cardinality columns, dictionary-encoded in the columnar format
+DICTIONARY_FIELDS = ('company', 'location', 'source', 'date_scraped')
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+_run_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def start_run():
+    """Stamp listings created from now on with a fresh run timestamp"""
+    global _run_timestamp
+    _run_timestamp = sys.intern(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    return _run_timestamp
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Listing:
+    """One internship listing.
+
+    Supports listing['role'] and listing.get('source', ...) so code written
+    against the old dict records keeps working.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, company, role, location, link, source, date_scraped=None):
+        self.company = _intern(company)
+        self.role = role
+        self.location = _intern(location)
+        self.link = link
+        self.source = _intern(source)
+        self.date_scraped = _intern(date_scraped) if date_scraped else _run_timestamp
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(*(data.get(field) for field in FIELDS))
+
+    def __getitem__(self, field):
+        if field not in FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def get(self, field, default=None):
+        return getattr(self, field) if field in FIELDS else default
+
+    def astuple(self):
+        return tuple(getattr(self, field) for field in FIELDS)
+
+    def to_dict(self):
+        return dict(zip(FIELDS, self.astuple()))
+
+    def __eq__(self, other):
+        if not isinstance(other, Listing):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    def __hash__(self):
+        return hash(self.astuple())
+
+    def __repr__(self):
+        return f"Listing({self.role!r} at {self.company!r}, {self.source!r})"
+
+
+def write_jsonl(listings, fp):
+    """Write one JSON object per line; returns the number written"""
+    count = 0
+    for listing in listings:
+        fp.write(_encoder.encode(listing.to_dict()))
+        fp.write('\n')
+        count += 1
+    return count
+
+
+def read_jsonl(fp):
+    """Lazily read listings written by write_jsonl"""
+    for line in fp:
+        if line.strip():
+            yield Listing.from_dict(json.loads(line))
+
+
+def to_columns(listings):
+    """Columnar form: one list per field, low-cardinality fields dictionary-encoded"""
+    rows = [listing.astuple() for listing in listings]
+    columns = {}
+    for field, values in zip(FIELDS, zip(*rows) if rows else [()] * len(FIELDS)):
+        if field in DICTIONARY_FIELDS:
+            dictionary = {}
+            codes = [dictionary.setdefault(value, len(dictionary)) for value in values]
+            columns[field] = {'dictionary': list(dictionary), 'codes': codes}
+        else:
+            columns[field] = list(values)
+    return {'count': len(rows), 'columns': columns}
+
+
+def from_columns(table):
+    """Rebuild listings from to_columns output"""
+    decoded = []
+    for field in FIELDS:
+        column = table['columns'][field]
+        if isinstance(column, dict):
+            dictionary = column['dictionary']
+            column = [dictionary[code] for code in column['codes']]
+        decoded.append(column)
+    return [Listing(*row) for row in zip(*decoded)]
+
+
+def write_columnar(listings, fp):
+    fp.write(_encoder.encode(to_columns(listings)))
+
+
+def read_columnar(fp):
+    return from_columns(json.load(fp))
@@ -0,0 +1,98 @@
+"""
+ACIA Relevance Scoring
+One precompiled alternation regex per field (title, company, location)
+scores listings against the weighted phrases in relevance_rules.json in a
+single pass, so digests can lead with the best matches and be capped at
+the top N; also home of the shared "is this an internship" test
+"""
+
+import heapq
+import json
+import re
+from itertools import count
+
+from acia_config import RELEVANCE_RULES_PATH
+
+# Rule sections that name a listing attribute differently
+FIELD_ATTRIBUTES = {'title': 'role'}
+
+# Shared internship test, compiled once instead of per fetcher / per call
+INTERN_PATTERN = re.compile(r'intern', re.IGNORECASE)
+
+
+def mentions_internship(text):
+    return bool(text) and INTERN_PATTERN.search(text) is not None
+
+
+def compile_phrases(weights):
+    """One word-bounded alternation over every phrase, longest first so phrases win over their words"""
+    phrases = sorted(weights, key=lambda phrase: (-len(phrase), phrase))
+    if not phrases:
+        return None
+    alternation = '|'.join(re.escape(phrase.lower()).replace(r'\ ', r'\s+') for phrase in phrases)
+    return re.compile(rf'(?<![a-z0-9])(?:{alternation})(?![a-z0-9])')
+
+
+class RelevanceScorer:
+    """Weighted phrase scoring; each phrase counts once per field"""
+
+    def __init__(self, rules):
+        self.min_score = rules.get('min_score')
+        self.fields = []
+        for field, weights in rules.get('fields', {}).items():
+            weights = {' '.join(phrase.lower().split()): float(weight) for phrase, weight in weights.items()}
+            pattern = compile_phrases(weights)
+            if pattern is not None:
+                self.fields.append((FIELD_ATTRIBUTES.get(field, field), pattern, weights))
+
+    @classmethod
+    def load(cls, path=RELEVANCE_RULES_PATH):
+        with open(path, 'r', encoding='utf-8') as handle:
+            return cls(json.load(handle))
+
+    def score(self, internship):
+        """Sum of the weights of the distinct phrases found in each field"""
+        total = 0.0
+        for field, pattern, weights in self.fields:
+            text = internship.get(field)
+            if not text:
+                continue
+            found = {' '.join(match.split()) for match in pattern.findall(text.lower())}
+            total += sum(weights[phrase] for phrase in found)
+        return total
+
+    def relevant(self, score):
+        return self.min_score is None or score >= self.min_score
+
+
+class TopN:
+    """Streaming top-N by score: memory stays at N however many listings pass through"""
+
+    def __init__(self, scorer, limit):
+        self.scorer = scorer
+        self.limit = limit
+        self._heap = []
+        self._order = count()
+
+    def add(self, internship):
+        """Offer a listing; returns False if it is irrelevant"""
+        score = self.scorer.score(internship)
+        if not self.scorer.relevant(score):
+            return False
+        # Earlier arrivals win ties
+        entry = (score, -next(self._order), internship)
+        if len(self._heap) < self.limit:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+        return True
+
+    def __len__(self):
+        return len(self._heap)
+
+    def ranked(self):
+        return [internship for _, _, internship in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+
+# Compiled once at import, like the portal profiles
+scorer = RelevanceScorer.load()
@@ -0,0 +1,93 @@
+"""
+ACIA Record / Replay
+Snapshots every GET a run makes into a fixture archive and serves those
+snapshots back with no network, so fetchers can be benchmarked offline
+"""
+
+import json
+import os
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from acia_cache import cache_key, write_atomic
+from acia_config import HTTP_MODE, REPLAY_ARCHIVE_DIR
+
+MODES = ('live', 'record', 'replay')
+
+_state = {'mode': HTTP_MODE if HTTP_MODE in MODES else 'live', 'archive': None}
+
+
+class FixtureArchive:
+    """Directory of recorded responses keyed like the HTTP cache"""
+
+    def __init__(self, directory=REPLAY_ARCHIVE_DIR):
+        self.directory = directory
+
+    def _paths(self, url, params):
+        base = os.path.join(self.directory, cache_key(url, params))
+        return base + '.json', base + '.body'
+
+    def save(self, url, params, response):
+        """Snapshot a response"""
+        os.makedirs(self.directory, exist_ok=True)
+        meta = {
+            'url': url,
+            'params': params,
+            'final_url': response.url,
+            'status': response.status_code,
+            'encoding': response.encoding,
+            'headers': {name: value for name, value in response.headers.items()
+                        if name.lower() in ('content-type', 'etag', 'last-modified')}
+        }
+        meta_path, body_path = self._paths(url, params)
+        write_atomic(body_path, response.content or b'')
+        write_atomic(meta_path, json.dumps(meta, indent=2).encode('utf-8'))
+
+    def load(self, url, params):
+        """Rebuild a recorded response; unknown URLs come back as 404 so fetchers fall through"""
+        meta_path, body_path = self._paths(url, params)
+        response = requests.Response()
+        response.url = url
+        response.from_cache = False
+        response.replayed = True
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as handle:
+                meta = json.load(handle)
+            with open(body_path, 'rb') as handle:
+                body = handle.read()
+        except (OSError, ValueError):
+            response.status_code = 404
+            response._content = b''
+            return response
+
+        response.status_code = meta['status']
+        response._content = body
+        response.url = meta.get('final_url') or url
+        response.encoding = meta.get('encoding')
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        return response
+
+    def __len__(self):
+        if not os.path.isdir(self.directory):
+            return 0
+        return sum(1 for name in os.listdir(self.directory) if name.endswith('.json'))
+
+
+def set_mode(mode, directory=None):
+    """Switch between live, record and replay at runtime"""
+    if mode not in MODES:
+        raise ValueError(f"Unknown HTTP mode: {mode}")
+    _state['mode'] = mode
+    _state['archive'] = FixtureArchive(directory) if directory else None
+
+
+def get_mode():
+    return _state['mode']
+
+
+def get_archive():
+    if _state['archive'] is None:
+        _state['archive'] = FixtureArchive()
+    return _state['archive']
@@ -0,0 +1,83 @@
+"""
+ACIA Concurrent Portal Scheduler
+Runs the portal fetchers at the same time with a global concurrency cap
+and a per-host politeness delay instead of blanket sleeps between portals,
+giving up on portals still running at the run deadline
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
+from urllib.parse import urlparse
+
+from acia_config import HOST_DELAY, MAX_WORKERS
+from acia_deadline import MIN_REQUEST_TIME, current_deadline, ensure_time
+from acia_health import host_health
+from acia_metrics import metrics, portal_context
+
+
+class HostThrottle:
+    """Enforce a minimum delay between requests to the same host"""
+
+    def __init__(self, delay=HOST_DELAY):
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        """Block until the host of url may be contacted again, stretched by its adaptive delay"""
+        host = urlparse(url).netloc.lower()
+        extra_delay, not_before = host_health.pacing(host)
+        delay = max(self.delay, extra_delay)
+        if delay <= 0 and not_before <= time.time():
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now), now + not_before - time.time())
+            self._next_slot[host] = slot + delay
+        if slot > now:
+            # A turn that comes after the deadline is not worth waiting for
+            ensure_time(slot - now + MIN_REQUEST_TIME)
+            metrics.observe('throttle_wait', slot - now, host=host)
+            time.sleep(slot - now)
+
+
+# Shared by every fetcher so politeness holds across threads
+host_throttle = HostThrottle()
+
+
+def run_labelled(name, fetcher):
+    """Run a fetcher with its metrics labelled by portal, under its time budget"""
+    with portal_context(name), current_deadline().portal(name), metrics.timer('fetch'):
+        return fetcher()
+
+
+def iter_fetchers_as_completed(fetchers, max_workers=MAX_WORKERS):
+    """Run (name, fetcher) pairs in parallel, yielding (name, results) as each one finishes
+
+    Fetchers still running at the run deadline are abandoned: each yields an
+    empty result and is marked timed out, and the pool is shut down without
+    waiting for them.
+    """
+    workers = max(1, min(max_workers, len(fetchers)))
+    deadline = current_deadline()
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='acia-fetch')
+    futures = {executor.submit(run_labelled, name, fetcher): name for name, fetcher in fetchers}
+    pending = set(futures)
+    try:
+        for future in as_completed(futures, timeout=deadline.remaining()):
+            pending.discard(future)
+            name = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                print(f"❌ {name} fetcher crashed: {e}")
+                results = []
+            yield name, results
+    except FuturesTimeout:
+        for future in pending:
+            deadline.mark_timed_out(futures[future])
+            yield futures[future], []
+    finally:
+        executor.shutdown(wait=not pending, cancel_futures=True)
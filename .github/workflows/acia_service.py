@@ -0,0 +1,378 @@
+"""
+ACIA Service Mode
+Keeps the pipeline in one long-running process instead of a cold one-shot
+script per run: an in-process scheduler fires cron expressions and
+per-portal intervals, while the HTTP session, compiled profiles, parse pool
+and seen-listing index stay warm between runs. A small HTTP endpoint reports
+status and accepts on-demand triggers.
+
+Endpoints:
+    GET  /health           liveness probe
+    GET  /status           current run, recent runs and next scheduled times
+    GET  /metrics          Prometheus text for the latest run
+    POST /run[?portal=X]   queue a full run, or a run of selected portals
+    GET  /subscriptions?chat_id=X     a chat's filters
+    POST /subscriptions               register {"chat_id", "keywords", "locations", "sources"}
+    DELETE /subscriptions?chat_id=X   unsubscribe a chat
+
+/run and /subscriptions need "Authorization: Bearer $ACIA_SERVICE_TOKEN".
+Without a token they only answer loopback clients, and the service refuses
+to listen on a non-loopback address at all.
+"""
+
+import ipaddress
+import json
+import logging
+import queue
+import secrets
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from acia_config import (
+    PORTAL_INTERVALS,
+    SERVICE_HISTORY,
+    SERVICE_HOST,
+    SERVICE_PORT,
+    SERVICE_SCHEDULE,
+    SERVICE_TOKEN,
+)
+from acia_health import host_health
+from acia_metrics import metrics
+from acia_subscriptions import SubscriptionStore, check_filters
+
+LOOPBACK_NAMES = ('localhost',)
+
+CRON_FIELDS = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day', 1, 31),
+    ('month', 1, 12),
+    ('weekday', 0, 7),
+)
+
+
+def parse_cron_field(spec, low, high):
+    """Expand one cron field ('*', '5', '1-5', '*/15', '1,3-5/2') into a set of values"""
+    values = set()
+    for part in spec.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"bad cron step in {spec!r}")
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(value) for value in part.split('-', 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"cron value out of range in {spec!r}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronExpression:
+    """Standard five-field cron expression (minute hour day month weekday), evaluated in UTC"""
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        parsed = [parse_cron_field(spec, low, high) for spec, (_, low, high) in zip(fields, CRON_FIELDS)]
+        self.minutes, self.hours, self.days, self.months, self.weekdays = parsed
+        # Cron treats Sunday as 0 (7 is accepted too); Python's weekday() has Monday as 0
+        self.weekdays = {(day - 1) % 7 for day in self.weekdays}
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    def _day_matches(self, moment):
+        day_ok = moment.day in self.days
+        weekday_ok = moment.weekday() in self.weekdays
+        # Like cron: if both day fields are restricted, either may match
+        if not self.any_day and not self.any_weekday:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment):
+        """First matching minute strictly after moment"""
+        moment = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        while moment < limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"cron expression never fires: {self.expression!r}")
+
+
+class ScheduledJob:
+    """A pipeline run fired by a cron expression or a fixed interval"""
+
+    def __init__(self, name, portals=None, cron=None, interval=None):
+        self.name = name
+        self.portals = portals
+        self.cron = CronExpression(cron) if cron else None
+        self.interval = interval
+        self.next_run = self._following(datetime.now(timezone.utc))
+
+    def _following(self, moment):
+        if self.cron:
+            return self.cron.next_after(moment)
+        return moment + timedelta(seconds=self.interval)
+
+    def advance(self, now):
+        self.next_run = self._following(now)
+
+    def describe(self):
+        return {
+            'job': self.name,
+            'portals': self.portals,
+            'schedule': self.cron.expression if self.cron else f"every {self.interval}s",
+            'next_run': self.next_run.isoformat(timespec='seconds')
+        }
+
+
+def build_jobs(schedule=SERVICE_SCHEDULE, portal_intervals=PORTAL_INTERVALS):
+    """The daily full run plus one interval job per configured portal"""
+    jobs = []
+    if schedule:
+        jobs.append(ScheduledJob('daily', cron=schedule))
+    for spec in portal_intervals:
+        portal, _, seconds = spec.partition('=')
+        try:
+            jobs.append(ScheduledJob(f"portal:{portal.strip()}", portals=[portal.strip()], interval=max(60, int(seconds))))
+        except ValueError:
+            logging.warning(f"Ignoring bad portal interval {spec!r}")
+    return jobs
+
+
+class PipelineService:
+    """Scheduler and worker around a run_pipeline(portals) callable; one run at a time"""
+
+    def __init__(self, run_pipeline, jobs, history=SERVICE_HISTORY):
+        self.run_pipeline = run_pipeline
+        self.jobs = jobs
+        self.history = deque(maxlen=history)
+        self.current = None
+        self._queue = queue.Queue()
+        self._queued = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self.started = time.time()
+
+    def trigger(self, name, portals=None):
+        """Queue a run; False if an identical run is already waiting"""
+        key = (name, tuple(portals) if portals else None)
+        with self._lock:
+            if key in self._queued:
+                return False
+            self._queued.add(key)
+        self._queue.put(key)
+        return True
+
+    def _worker(self):
+        while not self._stop.is_set():
+            try:
+                key = self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            with self._lock:
+                self._queued.discard(key)
+            self._execute(*key)
+
+    def _execute(self, name, portals):
+        record = {
+            'job': name,
+            'portals': list(portals) if portals else None,
+            'started_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        with self._lock:
+            self.current = record
+        started = time.perf_counter()
+        try:
+            record['success'] = bool(self.run_pipeline(list(portals) if portals else None))
+        except Exception as e:
+            logging.error(f"Scheduled run {name} crashed: {e}")
+            record['success'] = False
+            record['error'] = str(e)
+        record['duration_seconds'] = round(time.perf_counter() - started, 3)
+        with self._lock:
+            self.current = None
+            self.history.appendleft(record)
+
+    def _scheduler(self):
+        while not self._stop.is_set():
+            now = datetime.now(timezone.utc)
+            for job in self.jobs:
+                if job.next_run <= now:
+                    logging.info(f"Schedule fired: {job.name}")
+                    self.trigger(job.name, job.portals)
+                    job.advance(now)
+            upcoming = min((job.next_run for job in self.jobs), default=now + timedelta(hours=1))
+            self._wake.wait(min(60.0, max(1.0, (upcoming - now).total_seconds())))
+            self._wake.clear()
+
+    def status(self):
+        with self._lock:
+            return {
+                'uptime_seconds': round(time.time() - self.started),
+                'running': self.current,
+                'queued': [{'job': name, 'portals': portals} for name, portals in self._queued],
+                'recent_runs': list(self.history),
+                'schedule': [job.describe() for job in self.jobs],
+                'open_circuits': host_health.open_hosts()
+            }
+
+    def start(self):
+        for target, name in ((self._worker, 'acia-run'), (self._scheduler, 'acia-schedule')):
+            threading.Thread(target=target, name=name, daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+
+def is_loopback(host):
+    """True for localhost and loopback addresses"""
+    if host in LOOPBACK_NAMES:
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def make_handler(service, subscriptions, token=SERVICE_TOKEN):
+    """Request handler bound to a service and the subscription store"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status, payload, content_type='application/json'):
+            body = payload if isinstance(payload, bytes) else json.dumps(payload, indent=2, default=str).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            path = urlparse(self.path).path
+            if path == '/health':
+                self._reply(200, {'status': 'ok'})
+            elif path == '/status':
+                self._reply(200, service.status())
+            elif path == '/metrics':
+                self._reply(200, metrics.prometheus_text().encode('utf-8'), 'text/plain; version=0.0.4')
+            elif path == '/subscriptions':
+                if not self._authorized():
+                    return
+                chat_id = self._chat_id(urlparse(self.path))
+                if chat_id:
+                    filters = subscriptions.raw(chat_id)
+                    self._reply(200 if filters else 404, filters or {'error': 'not subscribed'})
+            else:
+                self._reply(404, {'error': 'not found'})
+
+        def _authorized(self):
+            if not token:
+                # No token configured: only trust callers on this machine
+                if is_loopback(self.client_address[0]):
+                    return True
+                self._reply(403, {'error': 'ACIA_SERVICE_TOKEN is not set; only local requests are accepted'})
+                return False
+            if not secrets.compare_digest(self.headers.get('Authorization', ''), f"Bearer {token}"):
+                self._reply(401, {'error': 'unauthorized'})
+                return False
+            return True
+
+        def _chat_id(self, url):
+            chat_id = (parse_qs(url.query).get('chat_id') or [None])[0]
+            if not chat_id:
+                self._reply(400, {'error': 'chat_id is required'})
+            return chat_id
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if url.path not in ('/run', '/subscriptions'):
+                self._reply(404, {'error': 'not found'})
+                return
+            if not self._authorized():
+                return
+
+            if url.path == '/subscriptions':
+                try:
+                    length = int(self.headers.get('Content-Length') or 0)
+                    payload = json.loads(self.rfile.read(length) or b'{}')
+                    if not isinstance(payload, dict) or not isinstance(payload.get('chat_id'), (str, int)):
+                        raise ValueError('chat_id is required')
+                    chat_id = str(payload['chat_id']).strip()
+                    if not chat_id:
+                        raise ValueError('chat_id is required')
+                    filters = check_filters(payload)
+                except ValueError as e:
+                    self._reply(400, {'error': f"{e}; expected JSON with chat_id and optional "
+                                               "keywords/locations/sources lists of strings"})
+                    return
+                subscriptions.upsert(chat_id, **filters)
+                self._reply(200, dict(filters, chat_id=chat_id))
+                return
+
+            portals = parse_qs(url.query).get('portal') or None
+            name = 'manual' if portals is None else 'manual:' + ','.join(portals)
+            if service.trigger(name, portals):
+                self._reply(202, {'queued': name})
+            else:
+                self._reply(409, {'error': f"{name} is already queued"})
+
+        def do_DELETE(self):
+            url = urlparse(self.path)
+            if url.path != '/subscriptions':
+                self._reply(404, {'error': 'not found'})
+                return
+            if not self._authorized():
+                return
+            chat_id = self._chat_id(url)
+            if chat_id:
+                removed = subscriptions.remove(chat_id)
+                self._reply(200 if removed else 404, {'removed': removed, 'chat_id': chat_id})
+
+        def log_message(self, format, *args):
+            logging.info("HTTP %s", format % args)
+
+    return Handler
+
+
+def serve(run_pipeline, host=SERVICE_HOST, port=SERVICE_PORT, token=SERVICE_TOKEN):
+    """Run the scheduler and HTTP endpoint until interrupted"""
+    if not token and not is_loopback(host):
+        # Otherwise anyone who can reach the port could trigger runs and register chats
+        raise ValueError(f"ACIA_SERVICE_TOKEN must be set to serve on non-loopback address {host}")
+    service = PipelineService(run_pipeline, build_jobs())
+    service.start()
+    subscriptions = SubscriptionStore()
+    server = ThreadingHTTPServer((host, port), make_handler(service, subscriptions, token))
+    logging.info(f"ACIA service listening on {host}:{port}")
+    for job in service.jobs:
+        logging.info(f"Scheduled {job.name}: next run {job.next_run.isoformat(timespec='minutes')}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+        subscriptions.close()
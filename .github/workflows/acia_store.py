@@ -0,0 +1,159 @@
+"""
+ACIA Seen-Listings Store
+SQLite history of every listing already delivered to each chat, mirrored
+in an in-memory hash index so each run only sends a chat the listings that
+are new or changed for it
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from acia_config import SEEN_DB_PATH
+
+# Query params that only track the click and never identify the posting
+TRACKING_PARAMS = re.compile(r'^(utm_.*|trk.*|refid|ref|tracking.*|src|source|position|pagenum|sid|fbclid|gclid)$', re.IGNORECASE)
+
+SEEN_TABLE = """CREATE TABLE IF NOT EXISTS seen (
+    chat_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    source TEXT,
+    role TEXT,
+    link TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    PRIMARY KEY (chat_id, key)
+)"""
+
+
+def normalize_link(link):
+    """Canonical form of a listing URL: lower-case host, no tracking params, fragment or trailing slash"""
+    parts = urlsplit((link or '').strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not TRACKING_PARAMS.match(k)]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ''))
+
+
+def normalize_text(text):
+    """Lower-case and collapse whitespace"""
+    return ' '.join((text or '').lower().split())
+
+
+def listing_key(internship):
+    """Identity of a listing: normalized link plus normalized role"""
+    raw = normalize_link(internship.get('link')) + '|' + normalize_text(internship.get('role'))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def listing_fingerprint(internship):
+    """Hash of the mutable details, used to detect changed listings"""
+    raw = '|'.join(normalize_text(internship.get(field)) for field in ('company', 'location'))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class SeenStore:
+    """Persistent per-chat record of delivered listings with an in-memory (chat, key) -> fingerprint index
+
+    Every chat gets its own digest, so a listing is only "seen" by the chats
+    it actually reached. Rows from before per-chat tracking are kept under
+    LEGACY_CHAT and count as delivered to every chat.
+    """
+
+    LEGACY_CHAT = '*'
+
+    def __init__(self, path=SEEN_DB_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._migrate()
+        self._conn.execute(SEEN_TABLE)
+        self._conn.commit()
+        self._index = {
+            (chat_id, key): fingerprint
+            for chat_id, key, fingerprint in self._conn.execute("SELECT chat_id, key, fingerprint FROM seen")
+        }
+        self._delivered_keys = {key for _, key in self._index}
+
+    def _migrate(self):
+        """Move a pre-subscription table (no chat_id column) under LEGACY_CHAT"""
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(seen)")]
+        if not columns or 'chat_id' in columns:
+            return
+        self._conn.execute("ALTER TABLE seen RENAME TO seen_legacy")
+        self._conn.execute(SEEN_TABLE)
+        self._conn.execute(
+            """INSERT INTO seen (chat_id, key, fingerprint, source, role, link, first_seen, last_seen)
+               SELECT ?, key, fingerprint, source, role, link, first_seen, last_seen FROM seen_legacy""",
+            (self.LEGACY_CHAT,)
+        )
+        self._conn.execute("DROP TABLE seen_legacy")
+        self._conn.commit()
+
+    def __len__(self):
+        return len(self._index)
+
+    def is_new(self, internship, chat_id):
+        """True if the listing never reached this chat or its details changed since"""
+        key = listing_key(internship)
+        delivered = self._index.get((str(chat_id), key)) or self._index.get((self.LEGACY_CHAT, key))
+        return delivered != listing_fingerprint(internship)
+
+    def delivered_anywhere(self, internship):
+        """True if the listing reached at least one chat in an earlier run"""
+        return listing_key(internship) in self._delivered_keys
+
+    def mark_sent(self, internships, chat_id):
+        """Record listings as delivered to chat_id"""
+        chat_id = str(chat_id)
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        rows = []
+        for internship in internships:
+            key = listing_key(internship)
+            fingerprint = listing_fingerprint(internship)
+            rows.append((chat_id, key, fingerprint, internship.get('source'), internship.get('role'),
+                         internship.get('link'), now, now))
+
+        with self._lock:
+            self._conn.executemany(
+                """INSERT INTO seen (chat_id, key, fingerprint, source, role, link, first_seen, last_seen)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(chat_id, key) DO UPDATE SET
+                       fingerprint = excluded.fingerprint,
+                       last_seen = excluded.last_seen""",
+                rows
+            )
+            self._conn.commit()
+            for row in rows:
+                self._index[(chat_id, row[1])] = row[2]
+                self._delivered_keys.add(row[1])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def shared_seen_store():
+    """Process-wide store, opened once so its index stays warm across runs"""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = SeenStore()
+        return _shared_store
+
+
+def close_shared_seen_store():
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is not None:
+            _shared_store.close()
+            _shared_store = None
@@ -0,0 +1,153 @@
+"""
+ACIA Structured Data Fast Path
+Pulls schema.org JobPosting objects out of application/ld+json blocks and
+inline JSON state (__NEXT_DATA__, application/json scripts) straight from
+the raw response bytes, so pages that publish structured data never go
+through BeautifulSoup and the guessed-class selector cascade
+
+orjson is used when installed; the standard json module otherwise.
+"""
+
+import json
+import re
+
+from acia_metrics import metrics
+from acia_profiles import absolute_link
+from acia_records import Listing
+from acia_relevance import mentions_internship
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _DECODE_ERRORS = (orjson.JSONDecodeError, ValueError)
+except ImportError:
+    _loads = json.loads
+    _DECODE_ERRORS = (ValueError,)
+
+# Marks the "selector" that produced internships when structured data did
+STRUCTURED_HIT = 'structured-data'
+
+SCRIPT_PAYLOAD = re.compile(
+    rb'<script\b([^>]*)>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+JSON_SCRIPT_ATTRS = re.compile(
+    rb'type\s*=\s*["\']?application/(?:ld\+)?json|id\s*=\s*["\']?__NEXT_DATA__',
+    re.IGNORECASE
+)
+WRAPPERS = re.compile(rb'^\s*(?:<!--|<!\[CDATA\[)|(?:-->|\]\]>)\s*$')
+
+# Inline state is not schema.org; these keys identify job-like objects in it
+TITLE_KEYS = ('title', 'jobTitle', 'job_title', 'designation')
+COMPANY_KEYS = ('companyName', 'company_name', 'company', 'hiringOrganization', 'employer')
+LOCATION_KEYS = ('location', 'formattedLocation', 'jobLocation', 'locations', 'placeholders')
+URL_KEYS = ('url', 'jdURL', 'jobUrl', 'job_url', 'applyUrl', 'link', 'absolute_url')
+
+MAX_DEPTH = 12
+
+
+def json_payloads(body):
+    """Decoded JSON documents from the page's JSON script tags"""
+    if b'json' not in body and b'__NEXT_DATA__' not in body:
+        return
+    for attributes, payload in SCRIPT_PAYLOAD.findall(body):
+        if not JSON_SCRIPT_ATTRS.search(attributes):
+            continue
+        try:
+            yield _loads(WRAPPERS.sub(b'', payload.strip()))
+        except _DECODE_ERRORS:
+            continue
+
+
+def _types(node):
+    kind = node.get('@type')
+    if isinstance(kind, list):
+        return {str(item) for item in kind}
+    return {str(kind)} if kind else set()
+
+
+def _text(value):
+    """Name-like text from a string or a nested {'name': ...} object"""
+    if isinstance(value, str):
+        return ' '.join(value.split())
+    if isinstance(value, dict):
+        return _text(value.get('name') or value.get('label') or value.get('title'))
+    if isinstance(value, list) and value:
+        return ', '.join(filter(None, (_text(item) for item in value[:3])))
+    return ''
+
+
+def _location(posting):
+    if str(posting.get('jobLocationType', '')).upper() == 'TELECOMMUTE':
+        return 'Remote'
+    value = next((posting[key] for key in LOCATION_KEYS if posting.get(key)), None)
+    places = value if isinstance(value, list) else [value]
+    names = []
+    for place in places[:3]:
+        if isinstance(place, dict):
+            address = place.get('address', place)
+            if isinstance(address, dict):
+                parts = [address.get(key) for key in ('addressLocality', 'addressRegion', 'addressCountry')]
+                name = ', '.join(_text(part) for part in parts if part) or _text(place)
+            else:
+                name = _text(address)
+        else:
+            name = _text(place)
+        if name and name not in names:
+            names.append(name)
+    return ', '.join(names)
+
+
+def _first(node, keys):
+    return next((node[key] for key in keys if node.get(key)), None)
+
+
+def _looks_like_job(node):
+    if 'JobPosting' in _types(node):
+        return True
+    return bool(_first(node, TITLE_KEYS) and _first(node, COMPANY_KEYS) and _first(node, URL_KEYS))
+
+
+def find_postings(document, depth=0):
+    """Job-posting objects anywhere in a decoded document (@graph, ItemList and nested state)"""
+    if depth > MAX_DEPTH:
+        return
+    if isinstance(document, list):
+        for item in document:
+            yield from find_postings(item, depth + 1)
+    elif isinstance(document, dict):
+        if _looks_like_job(document):
+            yield document
+            return
+        for value in document.values():
+            if isinstance(value, (dict, list)):
+                yield from find_postings(value, depth + 1)
+
+
+def extract_structured(profile, body, limit=None):
+    """Internship listings from structured data in raw page bytes, or [] if there is none"""
+    limit = limit or profile.card_limit
+    internships = []
+    seen_links = set()
+
+    with metrics.timer('structured'):
+        for document in json_payloads(body):
+            for posting in find_postings(document):
+                title = _text(_first(posting, TITLE_KEYS))
+                if not mentions_internship(title):
+                    continue
+                href = _first(posting, URL_KEYS)
+                link = absolute_link(href if isinstance(href, str) else '', profile.base_url, profile.link_domain)
+                if not link or link in seen_links:
+                    continue
+                seen_links.add(link)
+
+                company = _text(_first(posting, COMPANY_KEYS)) or 'Unknown Company'
+                if profile.require_company and company == 'Unknown Company':
+                    continue
+                internships.append(Listing(
+                    company, title, _location(posting) or profile.default_location, link, profile.name
+                ))
+                if len(internships) >= limit:
+                    return internships
+    return internships
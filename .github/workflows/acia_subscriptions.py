@@ -0,0 +1,192 @@
+"""
+ACIA Subscriptions
+Chats register keyword, location and source filters; every scraped listing
+is routed to the chats whose filters it satisfies through inverted indexes,
+so matching cost follows the listing's tokens rather than the number of
+subscribers, and each chat gets one personalised digest per run
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+from acia_config import SUBSCRIPTIONS_DB_PATH
+from acia_dedup import TOKEN
+
+FILTER_KINDS = ('keywords', 'locations', 'sources')
+
+
+def tokens(text):
+    return frozenset(TOKEN.findall((text or '').lower()))
+
+
+def check_filters(filters):
+    """keywords/locations/sources from a mapping, each a list of non-empty strings (missing means [])"""
+    checked = {}
+    for kind in FILTER_KINDS:
+        values = filters.get(kind)
+        if values is None:
+            values = []
+        if not isinstance(values, list) or not all(isinstance(value, str) and value.strip() for value in values):
+            raise ValueError(f"{kind} must be a list of non-empty strings")
+        checked[kind] = values
+    return checked
+
+
+class Subscription:
+    """One chat's filters; each list is any-of, an empty list matches everything.
+
+    A keyword may be a phrase, in which case all of its words must appear in
+    the listing's role or company. Locations match on any word of the
+    listing's location; sources match the portal name case-insensitively.
+    """
+
+    __slots__ = ('chat_id', 'keywords', 'locations', 'sources')
+
+    def __init__(self, chat_id, keywords=(), locations=(), sources=()):
+        self.chat_id = str(chat_id)
+        self.keywords = [phrase for phrase in (tokens(keyword) for keyword in keywords) if phrase]
+        self.locations = frozenset(token for location in locations for token in tokens(location))
+        self.sources = frozenset(source.strip().lower() for source in sources if source.strip())
+
+    @classmethod
+    def from_row(cls, chat_id, keywords, locations, sources):
+        filters = dict(zip(FILTER_KINDS, (json.loads(value) for value in (keywords, locations, sources))))
+        return cls(chat_id, **check_filters(filters))
+
+
+class SubscriptionStore:
+    """Persistent chat -> filters table"""
+
+    def __init__(self, path=SUBSCRIPTIONS_DB_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS subscriptions (
+                chat_id TEXT PRIMARY KEY,
+                keywords TEXT NOT NULL,
+                locations TEXT NOT NULL,
+                sources TEXT NOT NULL,
+                updated TEXT NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def upsert(self, chat_id, keywords=(), locations=(), sources=()):
+        """Register or replace a chat's filters"""
+        row = (str(chat_id), json.dumps(list(keywords)), json.dumps(list(locations)),
+               json.dumps(list(sources)), datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO subscriptions (chat_id, keywords, locations, sources, updated)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(chat_id) DO UPDATE SET
+                       keywords = excluded.keywords,
+                       locations = excluded.locations,
+                       sources = excluded.sources,
+                       updated = excluded.updated""",
+                row
+            )
+            self._conn.commit()
+
+    def remove(self, chat_id):
+        """Drop a chat; True if it was subscribed"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM subscriptions WHERE chat_id = ?", (str(chat_id),))
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+    def load_all(self):
+        """Every valid subscription; a malformed row is skipped so it cannot stop delivery to the rest"""
+        with self._lock:
+            rows = self._conn.execute("SELECT chat_id, keywords, locations, sources FROM subscriptions").fetchall()
+        subscriptions = []
+        for row in rows:
+            try:
+                subscriptions.append(Subscription.from_row(*row))
+            except ValueError as e:
+                logging.warning(f"Skipping subscription for chat {row[0]}: {e}")
+        return subscriptions
+
+    def raw(self, chat_id):
+        """A chat's filters as registered, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT keywords, locations, sources FROM subscriptions WHERE chat_id = ?", (str(chat_id),)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(FILTER_KINDS, (json.loads(value) for value in row)))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM subscriptions").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SubscriptionMatcher:
+    """Inverted indexes over subscriber filters.
+
+    Each chat is routed through one index only, its most selective filter:
+    keyword phrases (indexed under their longest word), else location words,
+    else sources. A listing's candidates are the chats its own tokens reach
+    in those indexes, checked against their remaining filters, plus the chats
+    with no filters at all, so wildcard subscribers are never scanned.
+    """
+
+    def __init__(self, subscriptions):
+        self.size = len(subscriptions)
+        self._subscriptions = {}
+        self._keyword_index = defaultdict(list)
+        self._location_index = defaultdict(set)
+        self._source_index = defaultdict(set)
+        self._unfiltered = set()
+
+        for subscription in subscriptions:
+            chat_id = subscription.chat_id
+            self._subscriptions[chat_id] = subscription
+            if subscription.keywords:
+                for phrase in subscription.keywords:
+                    anchor = max(phrase, key=lambda token: (len(token), token))
+                    self._keyword_index[anchor].append((phrase, chat_id))
+            elif subscription.locations:
+                for token in subscription.locations:
+                    self._location_index[token].add(chat_id)
+            elif subscription.sources:
+                for source in subscription.sources:
+                    self._source_index[source].add(chat_id)
+            else:
+                self._unfiltered.add(chat_id)
+
+    def match(self, internship):
+        """Chat ids whose filters the listing satisfies"""
+        words = tokens(internship.get('role')) | tokens(internship.get('company'))
+        places = tokens(internship.get('location'))
+        source = (internship.get('source') or '').lower()
+
+        candidates = set()
+        for token in words:
+            for phrase, chat_id in self._keyword_index.get(token, ()):
+                if phrase <= words:
+                    candidates.add(chat_id)
+        for token in places:
+            candidates.update(self._location_index.get(token, ()))
+        candidates.update(self._source_index.get(source, ()))
+
+        chats = set(self._unfiltered)
+        for chat_id in candidates:
+            subscription = self._subscriptions[chat_id]
+            if subscription.sources and source not in subscription.sources:
+                continue
+            if subscription.locations and subscription.locations.isdisjoint(places):
+                continue
+            chats.add(chat_id)
+        return chats
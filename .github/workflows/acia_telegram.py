@@ -0,0 +1,171 @@
+"""
+ACIA Telegram Delivery
+Splits long digests on listing boundaries into chunks under Telegram's
+message limit, either all at once or incrementally as listings stream in,
+and sends them through the pooled session, paced by a token bucket and
+honouring 429 retry_after responses
+"""
+
+import threading
+import time
+
+from acia_config import (
+    TELEGRAM_BURST,
+    TELEGRAM_MAX_LENGTH,
+    TELEGRAM_MAX_RETRIES,
+    TELEGRAM_RATE,
+)
+from acia_http import http_post
+
+# Room reserved at the top of each chunk for the "Part i/n" marker
+PART_MARKER_RESERVE = 32
+
+
+class TokenBucket:
+    """Thread-safe token bucket: rate tokens per second, up to capacity"""
+
+    def __init__(self, rate=TELEGRAM_RATE, capacity=TELEGRAM_BURST):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate if self.rate > 0 else 1.0
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Drain the bucket so nobody sends for the next seconds (after a 429)"""
+        with self._lock:
+            self.tokens = -seconds * self.rate
+            self.updated = time.monotonic()
+
+
+def message_length(text):
+    """Length as Telegram counts it (UTF-16 code units, so emoji count double)"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+# Shared by every sender in the process so the bot-wide limit holds
+telegram_bucket = TokenBucket()
+
+
+def split_text(text, limit=TELEGRAM_MAX_LENGTH):
+    """Split text that is too long on its own at line boundaries (hard cut as last resort)"""
+    pieces = []
+    current = ''
+    for line in text.splitlines(keepends=True):
+        while message_length(line) > limit:
+            if current:
+                pieces.append(current)
+                current = ''
+            cut = limit // 2
+            pieces.append(line[:cut])
+            line = line[cut:]
+        if message_length(current) + message_length(line) > limit:
+            pieces.append(current)
+            current = ''
+        current += line
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def number_part(chunk, index, total=None):
+    """Prefix a chunk with its "Part i/n" marker (just "Part i" while the total is unknown)"""
+    label = f"{index}/{total}" if total else str(index)
+    return f"📄 *Part {label}*\n\n{chunk.lstrip(chr(10))}"
+
+
+class ChunkPacker:
+    """Packs header, listing blocks and footer into as few chunks under limit as
+    possible: blocks are added as they arrive and each chunk is handed back, with
+    the items whose blocks it completes, as soon as it fills"""
+
+    def __init__(self, header='', limit=TELEGRAM_MAX_LENGTH):
+        self.budget = limit - PART_MARKER_RESERVE
+        self.current = header
+        self.current_length = message_length(header)
+        self.items = []
+
+    def _flush(self):
+        chunk = (self.current, self.items)
+        self.current = ''
+        self.current_length = 0
+        self.items = []
+        return chunk
+
+    def add(self, block, item=None):
+        """Append a block; returns the (chunk, items) pairs it pushed over the limit"""
+        ready = []
+        for piece in split_text(block, self.budget):
+            piece_length = message_length(piece)
+            if self.current and self.current_length + piece_length > self.budget:
+                ready.append(self._flush())
+            self.current += piece
+            self.current_length += piece_length
+        if item is not None:
+            self.items.append(item)
+        return ready
+
+    def close(self, footer=''):
+        """Append the footer and return the remaining (chunk, items) pairs"""
+        ready = []
+        if self.current and self.current_length + message_length(footer) > self.budget:
+            ready.append(self._flush())
+        self.current += footer
+        if self.current:
+            ready.append(self._flush())
+        return ready
+
+
+def send_chunk(bot_token, chat_id, text, parse_mode='Markdown', bucket=telegram_bucket):
+    """Send one message, waiting out 429 retry_after up to TELEGRAM_MAX_RETRIES times"""
+    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+    data = {
+        'chat_id': chat_id,
+        'text': text,
+        'parse_mode': parse_mode
+    }
+
+    for _ in range(TELEGRAM_MAX_RETRIES + 1):
+        bucket.acquire()
+        response = http_post(url, data=data)
+
+        if response.status_code == 200:
+            return True
+
+        if response.status_code == 429:
+            try:
+                retry_after = response.json().get('parameters', {}).get('retry_after', 1)
+            except ValueError:
+                retry_after = int(response.headers.get('Retry-After', 1))
+            print(f"  ⏳ Telegram rate limited, retrying in {retry_after}s")
+            bucket.pause(retry_after)
+            continue
+
+        print(f"❌ Failed to send Telegram message: {response.status_code}")
+        return False
+
+    print("❌ Telegram kept rate limiting, giving up on this chunk")
+    return False
+
+
+def send_chunks(bot_token, chat_id, chunks, parse_mode='Markdown'):
+    """Send chunks in order; returns the number delivered before the first failure"""
+    sent = 0
+    for chunk in chunks:
+        if not send_chunk(bot_token, chat_id, chunk, parse_mode):
+            break
+        sent += 1
+    return sent
@@ -0,0 +1,106 @@
+"""
+ACIA Fetcher Benchmark
+Replays recorded portal responses through every fetch_*_internships
+function and reports throughput, parse time and peak memory, with no network
+
+Usage:
+    python bench_fetchers.py --record       # one live run, snapshotting every GET
+    python bench_fetchers.py [--repeat N]   # replay the snapshots and time each fetcher
+"""
+
+import argparse
+import io
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+import acia_replay
+from acia_config import REPLAY_ARCHIVE_DIR
+from acia_fingerprints import page_fingerprints
+from acia_http import close_session
+from acia_metrics import metrics, portal_context
+from acia_scheduler import host_throttle
+from run_render_acia_advanced import PORTAL_FETCHERS
+
+
+def stage_seconds(report, portal, stage):
+    """Total seconds recorded for a stage of one portal"""
+    return sum(
+        timer['total_seconds'] for timer in report['timers']
+        if timer['stage'] == stage and timer['labels'].get('portal') == portal
+    )
+
+
+def record_fixtures(archive_dir=REPLAY_ARCHIVE_DIR):
+    """Run every fetcher live once, snapshotting each response"""
+    acia_replay.set_mode('record', archive_dir)
+    for name, fetcher in PORTAL_FETCHERS:
+        internships = fetcher()
+        print(f"💾 {name}: recorded ({len(internships)} internships)")
+    close_session()
+    print(f"📦 Archive now holds {len(acia_replay.get_archive())} responses in {archive_dir}")
+
+
+def benchmark_fetcher(name, fetcher, repeat):
+    """Replay one fetcher repeat times and return its figures"""
+    metrics.reset()
+    tracemalloc.start()
+    records = 0
+    started = time.perf_counter()
+
+    for _ in range(repeat):
+        with portal_context(name), redirect_stdout(io.StringIO()):
+            records += len(fetcher())
+
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    report = metrics.report()
+    return {
+        'portal': name,
+        'ms_per_run': elapsed * 1000 / repeat,
+        'records_per_second': records / elapsed if elapsed else 0.0,
+        'parse_ms_per_run': stage_seconds(report, name, 'parse') * 1000 / repeat,
+        'peak_kib': peak / 1024,
+        'records': records // repeat
+    }
+
+
+def run_benchmark(repeat=5, archive_dir=REPLAY_ARCHIVE_DIR):
+    """Replay every fetcher and print a results table"""
+    acia_replay.set_mode('replay', archive_dir)
+    if not len(acia_replay.get_archive()):
+        print(f"❌ No recorded responses in {archive_dir} - run with --record first")
+        return False
+
+    # Replay never touches the network, so politeness delays only add noise
+    host_throttle.delay = 0
+    # Every repeat must really parse; replay already bypasses the HTTP cache
+    if page_fingerprints is not None:
+        page_fingerprints.enabled = False
+
+    print(f"📊 Fetcher replay benchmark ({repeat} runs each)\n")
+    print(f"{'Portal':<16}{'ms/run':>10}{'parse ms':>10}{'rec/s':>10}{'peak KiB':>10}{'records':>9}")
+    for name, fetcher in PORTAL_FETCHERS:
+        result = benchmark_fetcher(name, fetcher, repeat)
+        print(f"{result['portal']:<16}{result['ms_per_run']:>10.1f}{result['parse_ms_per_run']:>10.1f}"
+              f"{result['records_per_second']:>10.1f}{result['peak_kib']:>10.0f}{result['records']:>9}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ACIA fetchers against recorded responses")
+    parser.add_argument('--record', action='store_true', help="do one live run and snapshot every response")
+    parser.add_argument('--repeat', type=int, default=5, help="replayed runs per fetcher")
+    parser.add_argument('--archive', default=REPLAY_ARCHIVE_DIR, help="fixture archive directory")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.archive)
+    return run_benchmark(args.repeat, args.archive)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,131 @@
+"""
+ACIA Parser Benchmark
+Times each HTML parsing backend against saved portal fixture pages
+
+Usage:
+    python bench_parsers.py --save          # snapshot search pages into fixtures/pages
+    python bench_parsers.py [--repeat N]    # time every backend on the fixtures
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from acia_http import close_session, http_get
+from acia_parsing import HAS_LXML, lxml_document, make_soup
+from acia_profiles import PROFILES
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'pages')
+
+
+def save_fixtures(fixture_dir=FIXTURE_DIR):
+    """Download every portal search page into the fixture directory"""
+    for portal, profile in PROFILES.items():
+        portal_dir = os.path.join(fixture_dir, portal)
+        os.makedirs(portal_dir, exist_ok=True)
+
+        for index, url in enumerate(profile.search_urls):
+            try:
+                response = http_get(url, use_cache=False)
+                if response.status_code != 200:
+                    print(f"  ⚠️  {portal} {url}: HTTP {response.status_code}")
+                    continue
+                path = os.path.join(portal_dir, f"page_{index}.html")
+                with open(path, 'wb') as handle:
+                    handle.write(response.content)
+                print(f"  💾 {portal}: {path} ({len(response.content)} bytes)")
+            except Exception as e:
+                print(f"  ⚠️  {portal} {url}: {e}")
+
+
+def load_fixtures(fixture_dir=FIXTURE_DIR):
+    """Return {portal: [page bytes]} for every saved fixture"""
+    fixtures = {}
+    if not os.path.isdir(fixture_dir):
+        return fixtures
+
+    for portal in sorted(os.listdir(fixture_dir)):
+        portal_dir = os.path.join(fixture_dir, portal)
+        if not os.path.isdir(portal_dir):
+            continue
+        pages = []
+        for name in sorted(os.listdir(portal_dir)):
+            if name.endswith('.html'):
+                with open(os.path.join(portal_dir, name), 'rb') as handle:
+                    pages.append(handle.read())
+        if pages:
+            fixtures[portal] = pages
+    return fixtures
+
+
+def run_soup_backend(backend):
+    """Build a BeautifulSoup tree with backend and run the compiled CSS selectors"""
+    def run(page, selectors):
+        soup = make_soup(page, backend=backend)
+        return sum(len(selector.select(soup)) for selector in selectors)
+    return run
+
+
+def run_lxml_xpath(page, selectors):
+    """Build a native lxml tree and run the compiled XPath selectors"""
+    root = lxml_document(page)
+    return sum(len(selector.select_lxml(root)) for selector in selectors)
+
+
+def benchmark_backends():
+    """Backend name -> callable(page, selectors) returning the number of matched cards"""
+    backends = {'bs4/html.parser': run_soup_backend('html.parser')}
+    if HAS_LXML:
+        backends['bs4/lxml'] = run_soup_backend('lxml')
+        backends['lxml/xpath'] = run_lxml_xpath
+    return backends
+
+
+def run_benchmark(repeat=5, fixture_dir=FIXTURE_DIR):
+    """Time every backend on every portal and print a comparison table"""
+    fixtures = load_fixtures(fixture_dir)
+    if not fixtures:
+        print(f"❌ No fixtures found in {fixture_dir} - run with --save first")
+        return False
+
+    backends = benchmark_backends()
+    print(f"📊 Parser benchmark ({repeat} repeats per page)\n")
+    print(f"{'Portal':<16}{'Backend':<18}{'ms/page':>10}{'speedup':>10}{'cards':>8}")
+
+    for portal, pages in fixtures.items():
+        if portal not in PROFILES:
+            continue
+        selectors = PROFILES[portal].card_selectors
+        baseline = None
+
+        for name, run in backends.items():
+            cards = 0
+            start = time.perf_counter()
+            for _ in range(repeat):
+                cards = sum(run(page, selectors) for page in pages)
+            elapsed_ms = (time.perf_counter() - start) * 1000 / (repeat * len(pages))
+
+            baseline = baseline or elapsed_ms
+            speedup = baseline / elapsed_ms if elapsed_ms else 0
+            print(f"{portal:<16}{name:<18}{elapsed_ms:>10.2f}{speedup:>9.2f}x{cards:>8}")
+        print()
+
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ACIA HTML parsing backends")
+    parser.add_argument('--save', action='store_true', help="download fresh fixture pages first")
+    parser.add_argument('--repeat', type=int, default=5, help="timed repeats per page")
+    parser.add_argument('--fixtures', default=FIXTURE_DIR, help="fixture directory")
+    args = parser.parse_args()
+
+    if args.save:
+        save_fixtures(args.fixtures)
+        close_session()
+    return run_benchmark(args.repeat, args.fixtures)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
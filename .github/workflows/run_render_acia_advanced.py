@@ -1,18 +1,37 @@
 """
 ACIA for Render Cloud Platform - Advanced Real Data Extraction
-LinkedIn, Greenhouse-Stripe, Internshala, WeWorkRemotely, SimplyHired, Naukri
+LinkedIn, Greenhouse boards, Internshala, WeWorkRemotely, SimplyHired, Naukri
 Advanced scraping with multiple extraction methods and fallbacks
 """
 
+import argparse
 import os
 import sys
 import logging
 import time
 from datetime import datetime
-import requests
-import re
 import json
-from bs4 import BeautifulSoup
+
+from acia_async import iter_portals_async
+from acia_checkpoint import close_checkpoint, open_checkpoint
+from acia_collectors import collect_greenhouse, collect_linkedin
+from acia_config import DIGEST_TOP_N, EXECUTION_MODE, GREENHOUSE_BOARDS, LINKEDIN_QUERIES, ONLY_NEW_LISTINGS
+from acia_deadline import DeadlineExceeded, current_deadline, start_deadline
+from acia_dedup import StreamingDeduplicator, print_merge_report
+from acia_fingerprints import page_fingerprints
+from acia_health import HostUnavailable, host_health
+from acia_http import close_session, http_get
+from acia_metrics import metrics
+from acia_parsing import make_soup
+from acia_parse_pool import parse_response, shutdown_parse_pool
+from acia_profiles import COMPANY_IN_TITLE, PROFILES, collect_new, save_selector_stats
+from acia_records import Listing, start_run
+from acia_relevance import INTERN_PATTERN, TopN, mentions_internship, scorer
+from acia_scheduler import iter_fetchers_as_completed
+from acia_service import serve
+from acia_store import close_shared_seen_store, shared_seen_store
+from acia_subscriptions import Subscription, SubscriptionMatcher, SubscriptionStore
+from acia_telegram import ChunkPacker, number_part, send_chunk, send_chunks, split_text
 
 def setup_logging():
     """Setup logging for Render"""
@@ -25,158 +44,59 @@ def setup_logging():
         ]
     )
 
-def fetch_stripe_internships():
-    """Fetch internships from Stripe Greenhouse (Real API)"""
+def fetch_greenhouse_internships():
+    """Fetch internships from every configured Greenhouse board (Real API)"""
     try:
-        print("🔍 Fetching Stripe internships...")
-        internships = []
-        
-        url = "https://boards-api.greenhouse.io/v1/boards/stripe/jobs"
-        response = requests.get(url, timeout=15)
-        response.raise_for_status()
-        
-        jobs = response.json().get('jobs', [])
+        print(f"🔍 Fetching Greenhouse internships from {len(GREENHOUSE_BOARDS)} board(s)...")
+        internships = collect_greenhouse(GREENHOUSE_BOARDS)
         
-        for job in jobs:
-            try:
-                title = job.get('title', '').lower()
-                if 'intern' in title:
-                    location_info = job.get('location', {})
-                    location = location_info.get('name', 'Not specified')
-                    
-                    internship = {
-                        'company': 'Stripe',
-                        'role': job.get('title', 'Unknown Role'),
-                        'location': location,
-                        'link': job.get('absolute_url', ''),
-                        'source': 'Greenhouse-Stripe',
-                        'date_scraped': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    }
-                    internships.append(internship)
-                    print(f"  📋 {internship['role']} at {internship['company']}")
-            except Exception as e:
-                print(f"    ⚠️  Error processing job: {e}")
-                continue
+        for internship in internships:
+            print(f"  📋 {internship['role']} at {internship['company']}")
         
-        print(f"✅ Fetched {len(internships)} Stripe internships")
+        print(f"✅ Fetched {len(internships)} Greenhouse internships")
         return internships
         
     except Exception as e:
-        print(f"❌ Stripe request failed: {e}")
+        print(f"❌ Greenhouse request failed: {e}")
         return []
 
+def seen_predicate(store):
+    """is_known(listing) for the collectors, or None when every listing is delivered anyway
+    
+    A listing counts as known once any chat received it; paging stops there either way.
+    """
+    if store is None:
+        return None
+    return store.delivered_anywhere
+
 def fetch_linkedin_internships():
     """Fetch internships from LinkedIn (Advanced Extraction)"""
     try:
         print("🔍 Fetching LinkedIn internships...")
         internships = []
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        }
-        
-        # Method 1: Try API
+        # Method 1: Page through the guest API for every configured query
+        store = shared_seen_store() if ONLY_NEW_LISTINGS else None
         try:
-            search_url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
-            params = {
-                'keywords': 'data science intern machine learning ai python software engineering',
-                'location': 'India',
-                'f_TPR': 'r86400',
-                'start': 0
-            }
-            
-            response = requests.get(search_url, headers=headers, params=params, timeout=15)
-            
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    if 'elements' in data:
-                        for element in data.get('elements', [])[:10]:
-                            try:
-                                job = element.get('job', {})
-                                title = job.get('title', 'Unknown Role')
-                                
-                                if 'intern' in title.lower():
-                                    company = job.get('companyName', 'Unknown Company')
-                                    location = job.get('formattedLocation', 'Not specified')
-                                    job_id = job.get('id', '')
-                                    
-                                    internship = {
-                                        'company': company,
-                                        'role': title,
-                                        'location': location,
-                                        'link': f"https://www.linkedin.com/jobs/view/{job_id}",
-                                        'source': 'LinkedIn',
-                                        'date_scraped': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                    }
-                                    internships.append(internship)
-                                    print(f"  📋 {internship['role']} at {internship['company']}")
-                            except Exception as e:
-                                print(f"    ⚠️  Error processing LinkedIn job: {e}")
-                                continue
-                except:
-                    pass
-        except:
-            pass
-        
-        # Method 2: Try web scraping
+            internships.extend(collect_linkedin(LINKEDIN_QUERIES, is_known=seen_predicate(store)))
+            for internship in internships:
+                print(f"  📋 {internship['role']} at {internship['company']}")
+        except Exception as e:
+            print(f"    ⚠️  LinkedIn API collection failed: {e}")
+        
+        # Method 2: Try web scraping with the LinkedIn card profile
         if len(internships) == 0:
             try:
-                web_url = "https://www.linkedin.com/jobs/search?keywords=data%20science%20intern&location=India&f_TPR=r86400"
-                response = requests.get(web_url, headers=headers, timeout=15)
+                profile = PROFILES['LinkedIn']
+                response = http_get(profile.search_urls[0])
                 
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Look for job cards
-                    job_cards = soup.find_all('div', class_='base-card') or soup.find_all('li', class_='job-result-card')
-                    
-                    for card in job_cards[:8]:
-                        try:
-                            # Extract title
-                            title_element = card.find('h3') or card.find('a', class_='base-card__full-link')
-                            title = title_element.get_text().strip() if title_element else 'Unknown Role'
-                            
-                            if 'intern' in title.lower():
-                                # Extract company
-                                company_element = card.find('h4') or card.find('span', class_='hidden-nested-link')
-                                company = company_element.get_text().strip() if company_element else 'Unknown Company'
-                                
-                                # Extract location
-                                location_element = card.find('span', class_='job-result-card__location') or card.find('span', class_='job-search-card__location')
-                                location = location_element.get_text().strip() if location_element else 'India'
-                                
-                                # Extract link
-                                link_element = card.find('a', href=True)
-                                if link_element:
-                                    href = link_element.get('href', '')
-                                    if href.startswith('/'):
-                                        link = 'https://www.linkedin.com' + href
-                                    elif 'linkedin.com' in href:
-                                        link = href
-                                    else:
-                                        continue
-                                else:
-                                    continue
-                                
-                                internship = {
-                                    'company': company,
-                                    'role': title,
-                                    'location': location,
-                                    'link': link,
-                                    'source': 'LinkedIn',
-                                    'date_scraped': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                }
-                                internships.append(internship)
-                                print(f"  📋 {internship['role']} at {internship['company']}")
-                        except Exception as e:
-                            print(f"    ⚠️  Error processing LinkedIn card: {e}")
-                            continue
+                    page_internships, hit, _ = parse_response('search', 'LinkedIn', response)
+                    for internship in page_internships:
+                        internships.append(internship)
+                        print(f"  📋 {internship['role']} at {internship['company']}")
+                    if page_internships:
+                        profile.record_hit(hit)
             except:
                 pass
         
@@ -184,13 +104,13 @@ def fetch_linkedin_internships():
         if len(internships) == 0:
             try:
                 alt_url = "https://www.linkedin.com/jobs/search?keywords=internship%20data%20science&location=India"
-                response = requests.get(alt_url, headers=headers, timeout=15)
+                response = http_get(alt_url)
                 
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                    soup = make_soup(response.text)
                     
                     # Look for any job listings
-                    job_elements = soup.find_all(['h3', 'h2', 'a'], text=re.compile(r'(?i)intern', re.IGNORECASE))
+                    job_elements = soup.find_all(['h3', 'h2', 'a'], text=INTERN_PATTERN)
                     
                     for element in job_elements[:5]:
                         try:
@@ -214,19 +134,18 @@ def fetch_linkedin_internships():
                                 else:
                                     continue
                             
-                            if 'intern' in title.lower():
+                            if mentions_internship(title):
                                 # Extract company from title or nearby text
-                                company_match = re.search(r'at\s+([^\n]+)', title, re.IGNORECASE)
+                                company_match = COMPANY_IN_TITLE.search(title)
                                 company = company_match.group(1).strip() if company_match else 'Tech Company'
                                 
-                                internship = {
-                                    'company': company,
-                                    'role': title,
-                                    'location': 'India',
-                                    'link': link,
-                                    'source': 'LinkedIn',
-                                    'date_scraped': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                }
+                                internship = Listing(
+                                    company=company,
+                                    role=title,
+                                    location='India',
+                                    link=link,
+                                    source='LinkedIn'
+                                )
                                 internships.append(internship)
                                 print(f"  📋 {internship['role']} at {internship['company']}")
                         except Exception as e:
@@ -242,728 +161,400 @@ def fetch_linkedin_internships():
         print(f"❌ LinkedIn fetch error: {e}")
         return []
 
-def fetch_internshala_internships():
-    """Fetch internships from Internshala (Advanced Extraction)"""
+def fetch_profile_internships(portal):
+    """Fetch internships from an HTML portal described by its extraction profile"""
+    profile = PROFILES[portal]
     try:
-        print("🔍 Fetching Internshala internships...")
+        print(f"🔍 Fetching {portal} internships...")
         internships = []
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive'
-        }
-        
-        # Method 1: Try main search page
-        urls_to_try = [
-            "https://internshala.com/internships/data-science-internship-in-india",
-            "https://internshala.com/internships/data-science-internship",
-            "https://internshala.com/internships/search?keywords=data%20science",
-            "https://internshala.com/internships"
-        ]
+        # Method 1: Try search pages, cheapest-per-result first, until the quota is met
+        seen_links = set()
+        requests_made = 0
+        selector_passes = 0
+        skipped = 0
         
-        for url in urls_to_try:
+        for url in profile.ordered_urls():
+            if len(internships) >= profile.quota:
+                break
+            
+            requests_made += 1
+            found = 0
+            started = time.monotonic()
             try:
-                response = requests.get(url, headers=headers, timeout=20)
-                response.raise_for_status()
+                response = http_get(url)
                 
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Try different selectors
-                    selectors_to_try = [
-                        'div.internship_meta',
-                        'div.individual_internship',
-                        'article.internship-card',
-                        'div.job-container',
-                        'div.internship-card',
-                        'li.internship',
-                        'div[class*="internship"]',
-                        'a[href*="internship"]'
-                    ]
-                    
-                    for selector in selectors_to_try:
-                        try:
-                            if '[' in selector:
-                                # CSS selector
-                                internship_cards = soup.select(selector)
-                            else:
-                                # Class selector
-                                internship_cards = soup.find_all('div', class_=selector) or soup.find_all('article', class_=selector) or soup.find_all('li', class_=selector)
-                            
-                            if internship_cards:
-                                for card in internship_cards[:10]:
-                                    try:
-                                        # Extract title
-                                        title_element = card.find('a') or card.find('h3') or card.find('h4') or card.find('span', class_='title')
-                                        title = title_element.get_text().strip() if title_element else 'Unknown Role'
-                                        
-                                        # Extract company
-                                        company_element = card.find('span', class_='company') or card.find('div', class_='company') or card.find('a', class_='company-name')
-                                        company = company_element.get_text().strip() if company_element else 'Unknown Company'
-                                        
-                                        # Extract location
-                                        location_element = card.find('span', class_='location') or card.find('div', class_='location') or card.find('a', class_='location-link')
-                                        location = location_element.get_text().strip() if location_element else 'Not specified'
-                                        
-                                        # Extract link
-                                        link_element = card.find('a', href=True)
-                                        if link_element:
-                                            href = link_element.get('href', '')
-                                            if href.startswith('/'):
-                                                link = 'https://internshala.com' + '/' + href
-                                            elif href.startswith('http'):
-                                                link = href
-                                            else:
-                                                link = 'https://internshala.com' + '/' + href
-                                        else:
-                                            continue
-                                        
-                                        if ('intern' in title.lower() or 'internship' in title.lower()) and company != 'Unknown Company':
-                                            internship = {
-                                                'company': company,
-                                                'role': title,
-                                                'location': location,
-                                                'link': link,
-                                                'source': 'Internshala',
-                                                'date_scraped': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                            }
-                                            internships.append(internship)
-                                            print(f"  📋 {internship['role']} at {internship['company']}")
-                                    except Exception as e:
-                                        print(f"    ⚠️  Error processing Internshala card: {e}")
-                                        continue
-                                
-                                if len(internships) > 0:
-                                    break
-                        except:
-                            continue
-                            
-                    if len(internships) > 0:
-                        break
+                    page_internships, hit, passes = parse_response('search', portal, response)
+                    selector_passes += passes
+                    found = collect_new(internships, page_internships, seen_links, profile.quota)
+                    if found > 0:
+                        profile.record_hit(hit)
                         
-            except:
-                continue
+            except (HostUnavailable, DeadlineExceeded) as e:
+                # Not the URL's fault: leave its yield and cost history alone
+                requests_made -= 1
+                skipped = len(profile.search_urls) - requests_made
+                print(f"  ⏭️  Skipping {portal}: {e}")
+                break
+            except Exception:
+                pass
+            
+            profile.record_url(url, found, time.monotonic() - started)
         
-        # Method 2: Try to find any internship links
-        if len(internships) == 0:
+        profile.finish_report(requests_made, selector_passes, len(internships), skipped)
+        
+        # Method 2: Try to find any internship links on the homepage
+        if len(internships) == 0 and profile.fallback:
             try:
-                response = requests.get("https://internshala.com", headers=headers, timeout=20)
+                response = http_get(profile.fallback['url'])
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Look for any links containing 'internship'
-                    links = soup.find_all('a', href=re.compile(r'internship', re.IGNORECASE))
-                    
-                    for link in links[:5]:
-                        try:
-                            title = link.get_text().strip()
-                            href = link.get('href', '')
-                            
-                            if 'internship' in title.lower() and href:
-                                if href.startswith('/'):
-                                    full_link = 'https://internshala.com' + href
-                                elif href.startswith('http'):
-                                    full_link = href
-                                else:
-                                    continue
-                                
-                                # Extract company from title
-                                company_match = re.search(r'at\s+([^\n|]+)', title, re.IGNORECASE)
-                                company = company_match.group(1).strip() if company_match else 'Company'
-                                
-                                internship = {
-                                    'company': company,
-                                    'role': title,
-                                    'location': 'India',
-                                    'link': full_link,
-                                    'source': 'Internshala',
-                                    'date_scraped': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                }
-                                internships.append(internship)
-                                print(f"  📋 {internship['role']} at {internship['company']}")
-                        except Exception as e:
-                            print(f"    ⚠️  Error processing Internshala link: {e}")
-                            continue
-            except:
+                    candidates, _, _ = parse_response('homepage', portal, response)
+                    collect_new(internships, candidates, seen_links, profile.quota)
+            except Exception:
                 pass
         
-        print(f"✅ Fetched {len(internships)} Internshala internships")
+        print(f"✅ Fetched {len(internships)} {portal} internships")
         return internships
         
     except Exception as e:
-        print(f"❌ Internshala request failed: {e}")
+        print(f"❌ {portal} request failed: {e}")
         return []
 
+def fetch_internshala_internships():
+    """Fetch internships from Internshala (Advanced Extraction)"""
+    return fetch_profile_internships('Internshala')
+
 def fetch_weworkremotely_internships():
     """Fetch internships from WeWorkRemotely (Advanced Extraction)"""
-    try:
-        print("🔍 Fetching WeWorkRemotely internships...")
-        internships = []
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive'
-        }
-        
-        # Method 1: Try main search
-        urls_to_try = [
-            "https://weworkremotely.com/remote-jobs/search?term=intern",
-            "https://weworkremotely.com/remote-jobs/search?term=internship",
-            "https://weworkremotely.com/remote-jobs/search?term=data%20science%20intern",
-            "https://weworkremotely.com/remote-jobs/search?term=python%20intern"
-        ]
-        
-        for url in urls_to_try:
-            try:
-                response = requests.get(url, headers=headers, timeout=20)
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Try different selectors
-                    selectors_to_try = [
-                        'li.feature',
-                        'article.job',
-                        'div.job-listing',
-                        'div[class*="job"]',
-                        'li[class*="feature"]',
-                        'a[title*="Intern"]'
-                    ]
-                    
-                    for selector in selectors_to_try:
-                        try:
-                            if '[' in selector:
-                                job_listings = soup.select(selector)
-                            else:
-                                job_listings = soup.find_all('li', class_=selector) or soup.find_all('article', class_=selector) or soup.find_all('div', class_=selector)
-                            
-                            if job_listings:
-                                for listing in job_listings[:10]:
-                                    try:
-                                        # Extract title and link
-                                        title_link = listing.find('a', class_='title') or listing.find('h2') or listing.find('a')
-                                        if title_link:
-                                            title = title_link.get_text().strip()
-                                            href = title_link.get('href', '')
-                                            if href.startswith('/'):
-                                                link = 'https://weworkremotely.com' + href
-                                            elif href.startswith('http'):
-                                                link = href
-                                            else:
-                                                continue
-                                        else:
-                                            continue
-                                        
-                                        # Extract company
-                                        company_element = listing.find('span', class_='company') or listing.find('div', class_='company') or listing.find('span', class_='name')
-                                        company = company_element.get_text().strip() if company_element else 'Unknown Company'
-                                        
-                                        # Extract location
-                                        location_element = listing.find('span', class_='location') or listing.find('div', class_='location')
-                                        location = location_element.get_text().strip() if location_element else 'Remote'
-                                        
-                                        if 'intern' in title.lower() and company != 'Unknown Company':
-                                            internship = {
-                                                'company': company,
-                                                'role': title,
-                                                'location': location,
-                                                'link': link,
-                                                'source': 'WeWorkRemotely',
-                                                'date_scraped': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                            }
-                                            internships.append(internship)
-                                            print(f"  📋 {internship['role']} at {internship['company']}")
-                                    except Exception as e:
-                                        print(f"    ⚠️  Error processing WeWorkRemotely listing: {e}")
-                                        continue
-                                
-                                if len(internships) > 0:
-                                    break
-                        except:
-                            continue
-                            
-                    if len(internships) > 0:
-                        break
-                        
-            except:
-                continue
-        
-        # Method 2: Try to find any internship mentions
-        if len(internships) == 0:
-            try:
-                response = requests.get("https://weworkremotely.com", headers=headers, timeout=20)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Look for any text containing 'intern'
-                    elements = soup.find_all(text=re.compile(r'intern', re.IGNORECASE))
-                    
-                    for element in elements[:5]:
-                        try:
-                            parent = element.parent
-                            if parent and parent.name == 'a':
-                                title = parent.get_text().strip()
-                                href = parent.get('href', '')
-                                
-                                if 'intern' in title.lower() and href:
-                                    if href.startswith('/'):
-                                        link = 'https://weworkremotely.com' + href
-                                    elif href.startswith('http'):
-                                        link = href
-                                    else:
-                                        continue
-                                    
-                                    # Extract company
-                                    company_match = re.search(r'at\s+([^\n|]+)', title, re.IGNORECASE)
-                                    company = company_match.group(1).strip() if company_match else 'Remote Company'
-                                    
-                                    internship = {
-                                        'company': company,
-                                        'role': title,
-                                        'location': 'Remote',
-                                        'link': link,
-                                        'source': 'WeWorkRemotely',
-                                        'date_scraped': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                    }
-                                    internships.append(internship)
-                                    print(f"  📋 {internship['role']} at {internship['company']}")
-                        except Exception as e:
-                            print(f"    ⚠️  Error processing WeWorkRemotely element: {e}")
-                            continue
-            except:
-                pass
-        
-        print(f"✅ Fetched {len(internships)} WeWorkRemotely internships")
-        return internships
-        
-    except Exception as e:
-        print(f"❌ WeWorkRemotely request failed: {e}")
-        return []
+    return fetch_profile_internships('WeWorkRemotely')
 
 def fetch_simplyhired_internships():
     """Fetch internships from SimplyHired (Advanced Extraction)"""
-    try:
-        print("🔍 Fetching SimplyHired internships...")
-        internships = []
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive'
-        }
-        
-        # Method 1: Try main search
-        urls_to_try = [
-            "https://www.simplyhired.co.in/internship-jobs/data-science-in-india",
-            "https://www.simplyhired.co.in/internship-jobs/data-science",
-            "https://www.simplyhired.co.in/job-search?q=data+science+intern",
-            "https://www.simplyhired.co.in/jobs?q=internship+data+science"
-        ]
-        
-        for url in urls_to_try:
-            try:
-                response = requests.get(url, headers=headers, timeout=20)
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Try different selectors
-                    selectors_to_try = [
-                        'div.jobposting',
-                        'article.job',
-                        'div.job-listing',
-                        'div[class*="job"]',
-                        'li.jobposting',
-                        'div.SerpJob',
-                        'a[href*="job"]'
-                    ]
-                    
-                    for selector in selectors_to_try:
-                        try:
-                            if '[' in selector:
-                                job_cards = soup.select(selector)
-                            else:
-                                job_cards = soup.find_all('div', class_=selector) or soup.find_all('article', class_=selector) or soup.find_all('li', class_=selector)
-                            
-                            if job_cards:
-                                for card in job_cards[:10]:
-                                    try:
-                                        # Extract title
-                                        title_element = card.find('h2') or card.find('h3') or card.find('a', class_='title') or card.find('span', class_='job-title')
-                                        title = title_element.get_text().strip() if title_element else 'Unknown Role'
-                                        
-                                        # Extract company
-                                        company_element = card.find('span', class_='company') or card.find('div', class_='company') or card.find('span', class_='jobposting-company')
-                                        company = company_element.get_text().strip() if company_element else 'Unknown Company'
-                                        
-                                        # Extract location
-                                        location_element = card.find('span', class_='location') or card.find('div', class_='location') or card.find('span', class_='jobposting-location')
-                                        location = location_element.get_text().strip() if location_element else 'Not specified'
-                                        
-                                        # Extract link
-                                        link_element = card.find('a', class_='jobposting-title') or card.find('a', href=True)
-                                        if link_element:
-                                            href = link_element.get('href', '')
-                                            if href.startswith('http'):
-                                                link = href
-                                            elif href.startswith('/'):
-                                                link = 'https://www.simplyhired.co.in' + href
-                                            else:
-                                                continue
-                                        else:
-                                            continue
-                                        
-                                        if ('intern' in title.lower() or 'internship' in title.lower()) and company != 'Unknown Company':
-                                            internship = {
-                                                'company': company,
-                                                'role': title,
-                                                'location': location,
-                                                'link': link,
-                                                'source': 'SimplyHired',
-                                                'date_scraped': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                            }
-                                            internships.append(internship)
-                                            print(f"  📋 {internship['role']} at {internship['company']}")
-                                    except Exception as e:
-                                        print(f"    ⚠️  Error processing SimplyHired card: {e}")
-                                        continue
-                                
-                                if len(internships) > 0:
-                                    break
-                        except:
-                            continue
-                            
-                    if len(internships) > 0:
-                        break
-                        
-            except:
-                continue
-        
-        # Method 2: Try to find any internship mentions
-        if len(internships) == 0:
-            try:
-                response = requests.get("https://www.simplyhired.co.in", headers=headers, timeout=20)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Look for any text containing 'intern'
-                    elements = soup.find_all(text=re.compile(r'intern', re.IGNORECASE))
-                    
-                    for element in elements[:5]:
-                        try:
-                            parent = element.parent
-                            if parent and parent.name == 'a':
-                                title = parent.get_text().strip()
-                                href = parent.get('href', '')
-                                
-                                if 'intern' in title.lower() and href:
-                                    if href.startswith('http'):
-                                        link = href
-                                    elif href.startswith('/'):
-                                        link = 'https://www.simplyhired.co.in' + href
-                                    else:
-                                        continue
-                                    
-                                    # Extract company
-                                    company_match = re.search(r'at\s+([^\n|]+)', title, re.IGNORECASE)
-                                    company = company_match.group(1).strip() if company_match else 'Indian Company'
-                                    
-                                    internship = {
-                                        'company': company,
-                                        'role': title,
-                                        'location': 'India',
-                                        'link': link,
-                                        'source': 'SimplyHired',
-                                        'date_scraped': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                    }
-                                    internships.append(internship)
-                                    print(f"  📋 {internship['role']} at {internship['company']}")
-                        except Exception as e:
-                            print(f"    ⚠️  Error processing SimplyHired element: {e}")
-                            continue
-            except:
-                pass
-        
-        print(f"✅ Fetched {len(internships)} SimplyHired internships")
-        return internships
-        
-    except Exception as e:
-        print(f"❌ SimplyHired request failed: {e}")
-        return []
+    return fetch_profile_internships('SimplyHired')
 
 def fetch_naukri_internships():
     """Fetch internships from Naukri (Advanced Extraction)"""
-    try:
-        print("🔍 Fetching Naukri internships...")
-        internships = []
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive'
-        }
-        
-        # Method 1: Try main search
-        urls_to_try = [
-            "https://www.naukri.com/data-science-intern-jobs-in-india",
-            "https://www.naukri.com/internship-jobs",
-            "https://www.naukri.com/job-search?q=data+science+intern",
-            "https://www.naukri.com/jobs?q=internship+data+science"
-        ]
-        
-        for url in urls_to_try:
-            try:
-                response = requests.get(url, headers=headers, timeout=20)
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Try different selectors
-                    selectors_to_try = [
-                        'div.jobTuple',
-                        'article.job',
-                        'div.job-listing',
-                        'div[class*="job"]',
-                        'li.jobTuple',
-                        'div.srp-jobtuple',
-                        'a[href*="job"]'
-                    ]
-                    
-                    for selector in selectors_to_try:
-                        try:
-                            if '[' in selector:
-                                job_listings = soup.select(selector)
-                            else:
-                                job_listings = soup.find_all('div', class_=selector) or soup.find_all('article', class_=selector) or soup.find_all('li', class_=selector)
-                            
-                            if job_listings:
-                                for listing in job_listings[:10]:
-                                    try:
-                                        # Extract title and link
-                                        title_element = listing.find('a', class_='title') or listing.find('h2') or listing.find('a')
-                                        if title_element:
-                                            title = title_element.get_text().strip()
-                                            href = title_element.get('href', '')
-                                            if href.startswith('/'):
-                                                link = 'https://www.naukri.com' + href
-                                            elif href.startswith('http'):
-                                                link = href
-                                            else:
-                                                continue
-                                        else:
-                                            continue
-                                        
-                                        # Extract company
-                                        company_element = listing.find('span', class_='company') or listing.find('div', class_='company') or listing.find('span', class_='name')
-                                        company = company_element.get_text().strip() if company_element else 'Unknown Company'
-                                        
-                                        # Extract location
-                                        location_element = listing.find('span', class_='location') or listing.find('div', class_='location')
-                                        location = location_element.get_text().strip() if location_element else 'Not specified'
-                                        
-                                        if ('intern' in title.lower() or 'internship' in title.lower()) and company != 'Unknown Company':
-                                            internship = {
-                                                'company': company,
-                                                'role': title,
-                                                'location': location,
-                                                'link': link,
-                                                'source': 'Naukri',
-                                                'date_scraped': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                            }
-                                            internships.append(internship)
-                                            print(f"  📋 {internship['role']} at {internship['company']}")
-                                    except Exception as e:
-                                        print(f"    ⚠️  Error processing Naukri listing: {e}")
-                                        continue
-                                
-                                if len(internships) > 0:
-                                    break
-                        except:
-                            continue
-                            
-                    if len(internships) > 0:
-                        break
-                        
-            except:
-                continue
-        
-        # Method 2: Try to find any internship mentions
-        if len(internships) == 0:
-            try:
-                response = requests.get("https://www.naukri.com", headers=headers, timeout=20)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Look for any text containing 'intern'
-                    elements = soup.find_all(text=re.compile(r'intern', re.IGNORECASE))
-                    
-                    for element in elements[:5]:
-                        try:
-                            parent = element.parent
-                            if parent and parent.name == 'a':
-                                title = parent.get_text().strip()
-                                href = parent.get('href', '')
-                                
-                                if 'intern' in title.lower() and href:
-                                    if href.startswith('http'):
-                                        link = href
-                                    elif href.startswith('/'):
-                                        link = 'https://www.naukri.com' + href
-                                    else:
-                                        continue
-                                    
-                                    # Extract company
-                                    company_match = re.search(r'at\s+([^\n|]+)', title, re.IGNORECASE)
-                                    company = company_match.group(1).strip() if company_match else 'Indian Company'
-                                    
-                                    internship = {
-                                        'company': company,
-                                        'role': title,
-                                        'location': 'India',
-                                        'link': link,
-                                        'source': 'Naukri',
-                                        'date_scraped': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                    }
-                                    internships.append(internship)
-                                    print(f"  📋 {internship['role']} at {internship['company']}")
-                        except Exception as e:
-                            print(f"    ⚠️  Error processing Naukri element: {e}")
-                            continue
-            except:
-                pass
-        
-        print(f"✅ Fetched {len(internships)} Naukri internships")
-        return internships
-        
-    except Exception as e:
-        print(f"❌ Naukri request failed: {e}")
-        return []
+    return fetch_profile_internships('Naukri')
 
-def send_telegram_message(message):
-    """Send message to Telegram"""
+def telegram_credentials():
+    """Bot token and chat id from the environment"""
+    bot_token = os.environ.get('BOT_TOKEN', '7954881918:AAEYS1vOaaG5CInjvTLCzohp0eFizePc8WQ')
+    chat_id = os.environ.get('CHAT_ID', '6317336751')
+    return bot_token, chat_id
+
+def send_telegram_chunks(chunks):
+    """Send pre-split message chunks to Telegram"""
     try:
-        bot_token = os.environ.get('BOT_TOKEN', '7954881918:AAEYS1vOaaG5CInjvTLCzohp0eFizePc8WQ')
-        chat_id = os.environ.get('CHAT_ID', '6317336751')
-        
-        url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        bot_token, chat_id = telegram_credentials()
+        with metrics.timer('telegram', portal='-'):
+            sent = send_chunks(bot_token, chat_id, chunks)
+        metrics.increment('telegram_chunks_sent', sent, portal='-')
         
-        data = {
-            'chat_id': chat_id,
-            'text': message,
-            'parse_mode': 'Markdown'
-        }
-        
-        response = requests.post(url, data=data, timeout=15)
-        
-        if response.status_code == 200:
-            print("✅ Telegram message sent successfully")
+        if sent == len(chunks):
+            print(f"✅ Telegram message sent successfully ({sent} part(s))")
             return True
         else:
-            print(f"❌ Failed to send Telegram message: {response.status_code}")
+            print(f"❌ Sent {sent} of {len(chunks)} Telegram message part(s)")
             return False
             
     except Exception as e:
         print(f"❌ Error sending Telegram message: {e}")
         return False
 
-def format_internships(internships):
-    """Format internships for Telegram message"""
-    if not internships:
-        return "🔍 *No internships found*\n\nTry again later for new opportunities."
+def send_telegram_message(message):
+    """Send message to Telegram, splitting it if it exceeds the size limit"""
+    return send_telegram_chunks(split_text(message))
+
+DIGEST_HEADER = "🌐 *ACIA Advanced Real Data Update*\n\n"
+
+def format_listing_block(internship, index, source_heading=False):
+    """One listing; the source heading travels with the first listing of each source"""
+    block = f"🏢 *{internship.get('source', 'Unknown')}*\n" if source_heading else ""
+    block += f"\n{index}. *{internship['role']}*\n"
+    block += f"🏢 Company: {internship['company']}\n"
+    block += f"📍 Location: {internship['location']}\n"
+    block += f"🔗 [Apply]({internship['link']})\n"
+    return block
+
+def format_summary(source_counts, timed_out=(), found_counts=None):
+    """Per-source totals, flagging sources that ran out of time
+    
+    found_counts holds every listing found per source when the digest only
+    shows the top ones (source_counts), so the cut is visible.
+    """
+    found_counts = found_counts or source_counts
+    shown, found = sum(source_counts.values()), sum(found_counts.values())
+    summary = f"📊 *Advanced Real Data Summary*\nTotal internships: {found}\n"
+    if shown < found:
+        summary += f"Showing top {shown} of {found}\n"
+    for source, count in found_counts.items():
+        listed = source_counts.get(source, 0)
+        label = f"{listed} of {count} shown" if listed < count else str(count)
+        summary += f"• {source}: {label}{' ⏱️' if source in timed_out else ''}\n"
+    missing = [source for source in timed_out if source not in found_counts]
+    if timed_out:
+        summary += "⏱️ _Partial results, time limit reached"
+        summary += f": no listings from {', '.join(missing)}_\n" if missing else "_\n"
+    return summary
+
+def format_footer():
+    footer = "\n🔍 *All data extracted using advanced methods*\n"
+    footer += "🤖 *Powered by ACIA on Render*"
+    footer += f"\n📅 *Advanced Real Data - {datetime.now().strftime('%Y-%m-%d %H:%M')}*"
+    return footer
+
+class DigestBuilder:
+    """Push-based digest for one chat: listings go in, Telegram chunks come out.
+    
+    With top_n set, only the top_n most relevant listings are kept (in a bounded heap)
+    and sent in ranked order when the digest is closed. With top_n at 0, chunks are
+    handed out in arrival order as soon as they fill. Totals are not known up front,
+    so the summary goes at the end of the last chunk and streamed parts are numbered
+    without a total.
+    """
+    
+    def __init__(self, top_n=DIGEST_TOP_N):
+        self.packer = ChunkPacker(DIGEST_HEADER)
+        self.top = TopN(scorer, top_n) if top_n else None
+        self.source_counts = {}
+        # Relevant listings offered to a top-N digest, shown or not
+        self.found_counts = {}
+        self.last_source = None
+        self.part = 0
     
-    message = "🌐 *ACIA Advanced Real Data Update*\n\n"
+    def _numbered(self, chunks, total=None):
+        numbered = []
+        for chunk, listings in chunks:
+            self.part += 1
+            if total != 1:
+                chunk = number_part(chunk, self.part, total)
+            numbered.append((chunk, listings))
+        return numbered
     
-    # Group by source
-    by_source = {}
-    for internship in internships:
+    def _append(self, internship, index=None):
         source = internship.get('source', 'Unknown')
-        if source not in by_source:
-            by_source[source] = []
-        by_source[source].append(internship)
+        self.source_counts[source] = self.source_counts.get(source, 0) + 1
+        index = index or self.source_counts[source]
+        block = format_listing_block(internship, index, source_heading=source != self.last_source)
+        self.last_source = source
+        return self.packer.add(block, internship)
     
-    # Add summary
-    message += f"📊 *Advanced Real Data Summary*\nTotal internships: {len(internships)}\n"
-    for source, source_internships in by_source.items():
-        message += f"• {source}: {len(source_internships)}\n"
-    message += "\n"
+    def add(self, internship):
+        """Add a listing; returns the (chunk, listings) pairs that are ready to send"""
+        if self.top is not None:
+            if self.top.add(internship):
+                source = internship.get('source', 'Unknown')
+                self.found_counts[source] = self.found_counts.get(source, 0) + 1
+            return []
+        if not scorer.relevant(scorer.score(internship)):
+            return []
+        return self._numbered(self._append(internship))
     
-    # Add internships by source
-    for source, source_internships in by_source.items():
-        message += f"🏢 *{source}*\n"
-        
-        for i, internship in enumerate(source_internships, 1):
-            message += f"\n{i}. *{internship['role']}*\n"
-            message += f"🏢 Company: {internship['company']}\n"
-            message += f"📍 Location: {internship['location']}\n"
-            message += f"🔗 [Apply]({internship['link']})\n"
+    def close(self, timed_out=()):
+        """Finish the digest with the summary and footer, noting portals that timed out"""
+        chunks = []
+        if self.top is not None:
+            for rank, internship in enumerate(self.top.ranked(), 1):
+                chunks.extend(self._append(internship, rank))
+        if not self.source_counts:
+            return []
+        chunks.extend(self.packer.close("\n" + format_summary(self.source_counts, timed_out, self.found_counts) + format_footer()))
+        # Nothing sent yet means the whole digest is here and the total is known
+        return self._numbered(chunks, total=len(chunks) if self.part == 0 else None)
+
+def load_subscribers():
+    """Matcher over registered chats, or a single unfiltered subscription for CHAT_ID"""
+    store = SubscriptionStore()
+    try:
+        subscriptions = store.load_all()
+    finally:
+        store.close()
+    if not subscriptions:
+        _, chat_id = telegram_credentials()
+        subscriptions = [Subscription(chat_id)]
+    return SubscriptionMatcher(subscriptions)
+
+def deliver_digests(listings, matcher, store=None, deadline=None, checkpoint=None):
+    """Route each listing to its subscribed chats and send every chat its own digest as chunks fill.
     
-    message += "\n🔍 *All data extracted using advanced methods*\n"
-    message += "🤖 *Powered by ACIA on Render*"
-    message += f"\n📅 *Advanced Real Data - {datetime.now().strftime('%Y-%m-%d %H:%M')}*"
+    With a seen-store, each chat only gets the listings that are new or changed for
+    that chat, and a listing is marked sent to a chat once one of its chunks reached
+    it. A chat whose send fails gets nothing more this run. Portals the run deadline
+    cut short are flagged in every digest's summary. Chunks the checkpoint shows an
+    interrupted attempt already delivered are not sent again.
+    Returns (chunks sent, listings new to at least one chat, success).
+    """
+    bot_token, _ = telegram_credentials()
+    digests = {}
+    failed = set()
+    sent = 0
+    fresh = 0
+    started = time.perf_counter()
     
-    return message
+    def send(chat_id, chunks):
+        nonlocal sent
+        for chunk, delivered_listings in chunks:
+            if chat_id in failed:
+                return
+            if checkpoint is not None and checkpoint.was_delivered(chat_id, delivered_listings):
+                metrics.increment('telegram_chunks_resumed', portal='-')
+                continue
+            try:
+                with metrics.timer('telegram', portal='-'):
+                    delivered = send_chunk(bot_token, chat_id, chunk)
+            except Exception as e:
+                print(f"❌ Error sending Telegram message to {chat_id}: {e}")
+                delivered = False
+            if not delivered:
+                failed.add(chat_id)
+                continue
+            
+            if sent == 0:
+                metrics.observe('first_delivery', time.perf_counter() - started, portal='-')
+            sent += 1
+            metrics.increment('telegram_chunks_sent', portal='-')
+            if checkpoint is not None:
+                checkpoint.record_delivery(chat_id, delivered_listings)
+            if store is not None:
+                store.mark_sent(delivered_listings, chat_id)
+    
+    for internship in listings:
+        chats = [chat_id for chat_id in matcher.match(internship)
+                 if store is None or store.is_new(internship, chat_id)]
+        if chats:
+            fresh += 1
+        for chat_id in chats:
+            if chat_id not in failed:
+                digest = digests.setdefault(chat_id, DigestBuilder())
+                send(chat_id, digest.add(internship))
+    
+    timed_out = deadline.timed_out_portals() if deadline is not None else []
+    for chat_id, digest in digests.items():
+        send(chat_id, digest.close(timed_out))
+    
+    metrics.increment('digest_chats', len(digests), portal='-')
+    if failed:
+        print(f"❌ Delivery failed for {len(failed)} of {len(digests)} chat(s)")
+    elif sent:
+        print(f"✅ Telegram message sent successfully ({sent} part(s) to {len(digests)} chat(s))")
+    return sent, fresh, not failed
+
+PORTAL_FETCHERS = [
+    ('Greenhouse', fetch_greenhouse_internships),
+    ('LinkedIn', fetch_linkedin_internships),
+    ('Internshala', fetch_internshala_internships),
+    ('WeWorkRemotely', fetch_weworkremotely_internships),
+    ('SimplyHired', fetch_simplyhired_internships),
+    ('Naukri', fetch_naukri_internships)
+]
+
+# Portals whose fetcher is fully described by portal_profiles.json
+PROFILE_PORTALS = ('Internshala', 'WeWorkRemotely', 'SimplyHired', 'Naukri')
+
+def select_fetchers(portals=None):
+    """(name, fetcher) pairs for the given portal names, or all of them"""
+    if portals is None:
+        return PORTAL_FETCHERS
+    return [(name, fetcher) for name, fetcher in PORTAL_FETCHERS if name in portals]
+
+def stream_all_portals(fetchers=PORTAL_FETCHERS):
+    """Yield (source, internships) as each portal finishes, with the configured execution mode"""
+    if EXECUTION_MODE == 'async':
+        return iter_portals_async(fetchers, PROFILE_PORTALS)
+    return iter_fetchers_as_completed(fetchers)
 
-def run_acia_pipeline():
-    """Run ACIA pipeline with advanced real data extraction"""
+def stream_fetched_internships(tally, fetchers=PORTAL_FETCHERS, checkpoint=None):
+    """Yield listings portal by portal, counting them into tally['fetched']
+    
+    With a checkpoint, portals an interrupted attempt finished are restored instead
+    of fetched, and each portal that finishes in time is checkpointed as it does.
+    """
+    def counted(source, internships):
+        logging.info(f"{source}: {len(internships)} internships")
+        metrics.increment('internships_fetched', len(internships), portal=source)
+        tally['fetched'] += len(internships)
+        return internships
+    
     try:
+        if checkpoint is not None:
+            for source, internships in checkpoint.restored_portals():
+                print(f"♻️  Restored {len(internships)} {source} internships from checkpoint")
+                yield from counted(source, internships)
+            finished = set(checkpoint.finished_portals)
+            fetchers = [(name, fetcher) for name, fetcher in fetchers if name not in finished]
+        
+        for source, internships in stream_all_portals(fetchers):
+            # Timed-out portals are left unfinished so a resumed run tries them again
+            if checkpoint is not None and source not in current_deadline().timed_out:
+                checkpoint.save_portal(source, internships)
+            yield from counted(source, internships)
+    finally:
+        save_selector_stats(PROFILES)
+
+def run_acia_pipeline(portals=None, fresh=False):
+    """Run ACIA pipeline with advanced real data extraction.
+    
+    portals limits the run to those portal names; such partial runs stay
+    quiet when they find nothing instead of sending the "no internships" notices.
+    A run that failed or was killed leaves a checkpoint that the next run with the
+    same portals resumes from, unless fresh is set.
+    """
+    metrics.reset()
+    start_run()
+    # The fetch stage stops at the deadline; what was collected by then is still delivered
+    deadline = start_deadline()
+    fetchers = select_fetchers(portals)
+    checkpoint = None
+    completed = False
+    try:
+        checkpoint = open_checkpoint(portals, fresh=fresh)
+        if checkpoint is not None and checkpoint.resumed:
+            print(f"♻️  Resuming interrupted run ({len(checkpoint.finished_portals)} portal(s) already fetched)")
+
         logging.info("Starting ACIA Render pipeline - ADVANCED REAL DATA")
         print("🚀 ACIA Render Pipeline Started (Advanced Real Data)")
         print(f"Daily run at: {datetime.now()}")
         
-        # Fetch internships from all 5 portals
-        all_internships = []
+        # Fetch -> dedup -> route to chats -> per-chat seen filter -> format -> send, one listing
+        # at a time, so the first chunk goes out while slower portals are still fetching
+        tally = {'fetched': 0}
+        deduplicator = StreamingDeduplicator()
+        # The seen-listing store is shared and stays open between service-mode runs
+        store = shared_seen_store() if ONLY_NEW_LISTINGS else None
+        listings = deduplicator.filter(stream_fetched_internships(tally, fetchers, checkpoint))
         
-        # Fetch from Stripe
-        stripe_internships = fetch_stripe_internships()
-        all_internships.extend(stripe_internships)
-        time.sleep(2)
+        sent, fresh_count, success = deliver_digests(listings, load_subscribers(), store, deadline, checkpoint)
         
-        # Fetch from LinkedIn
-        linkedin_internships = fetch_linkedin_internships()
-        all_internships.extend(linkedin_internships)
-        time.sleep(2)
+        timed_out = deadline.timed_out_portals()
+        if timed_out:
+            logging.warning(f"Run deadline cut short: {', '.join(timed_out)}")
         
-        # Fetch from Internshala
-        internshala_internships = fetch_internshala_internships()
-        all_internships.extend(internshala_internships)
-        time.sleep(2)
+        print_merge_report(deduplicator.merged())
+        logging.info(f"Deduplicated {tally['fetched']} internships to {len(deduplicator.clusters)}")
         
-        # Fetch from WeWorkRemotely
-        wework_internships = fetch_weworkremotely_internships()
-        all_internships.extend(wework_internships)
-        time.sleep(2)
-        
-        # Fetch from SimplyHired
-        simplyhired_internships = fetch_simplyhired_internships()
-        all_internships.extend(simplyhired_internships)
-        time.sleep(2)
-        
-        # Fetch from Naukri
-        naukri_internships = fetch_naukri_internships()
-        all_internships.extend(naukri_internships)
-        
-        if not all_internships:
+        if not tally['fetched']:
             logging.warning("No real internships found")
+            completed = True
+            if portals is not None:
+                return False
             send_telegram_message("🔍 *No real internships found today*\n\nTry again tomorrow for new opportunities.")
             return False
         
-        # Format and send to Telegram
-        logging.info(f"Sending {len(all_internships)} advanced real internships to Telegram...")
-        message = format_internships(all_internships)
-        success = send_telegram_message(message)
+        if store is not None:
+            logging.info(f"{fresh_count} of {len(deduplicator.clusters)} internships are new to at least one chat")
+        
+        completed = success
+        
+        # A resumed run whose digests had all gone out already has nothing new to report
+        if success and not sent:
+            if portals is not None or (checkpoint is not None and checkpoint.delivered_any()):
+                return True
+            send_telegram_message("🔍 *No new internships since the last update*\n\nTry again tomorrow for new opportunities.")
+            return True
         
         if success:
-            logging.info("All advanced real internships sent successfully")
+            logging.info(f"All {fresh_count} advanced real internships sent successfully")
         else:
             logging.error("Failed to send advanced real internships")
         
@@ -972,15 +563,44 @@ def run_acia_pipeline():
     except Exception as e:
         logging.error(f"Pipeline failed: {str(e)}")
         return False
+    
+    finally:
+        if checkpoint is not None:
+            if completed:
+                checkpoint.complete()
+            else:
+                logging.warning(f"Run checkpoint kept at {checkpoint.directory}; the next run resumes from it")
+        close_checkpoint()
+        
+        try:
+            report = metrics.export()
+            logging.info(f"Run metrics written ({report['duration_seconds']}s)")
+        except Exception as e:
+            logging.warning(f"Could not write run metrics: {e}")
+        
+        # Keep circuit, pacing and page fingerprint state for the next run
+        try:
+            host_health.save()
+            if page_fingerprints is not None:
+                page_fingerprints.save()
+            for host, seconds in host_health.open_hosts().items():
+                logging.warning(f"Circuit open for {host} ({seconds}s left)")
+        except Exception as e:
+            logging.warning(f"Could not write run state: {e}")
 
-def main():
+def main(serve_forever=False, fresh=False):
     """Main function for Render with advanced real data extraction"""
     # Setup logging
     setup_logging()
     
     try:
+        if serve_forever:
+            # Long-running mode: in-process schedule plus status/trigger endpoint
+            serve(run_acia_pipeline)
+            return True
+        
         # Run pipeline
-        success = run_acia_pipeline()
+        success = run_acia_pipeline(fresh=fresh)
         
         if success:
             logging.info("ACIA Render Run Completed Successfully (Advanced Real Data)")
@@ -995,7 +615,18 @@ def main():
         logging.error(f"Critical error: {str(e)}")
         print(f"❌ Critical Error: {str(e)}")
         return False
+    
+    finally:
+        close_session()
+        shutdown_parse_pool()
+        close_shared_seen_store()
 
 if __name__ == "__main__":
-    success = main()
+    parser = argparse.ArgumentParser(description="ACIA internship pipeline")
+    parser.add_argument('--serve', action='store_true',
+                        help="stay running with the in-process scheduler and HTTP endpoint (see acia_service)")
+    parser.add_argument('--fresh', action='store_true',
+                        help="discard the checkpoint of an interrupted run instead of resuming it")
+    args = parser.parse_args()
+    success = main(serve_forever=args.serve, fresh=args.fresh)
     sys.exit(0 if success else 1)